@@ -0,0 +1,80 @@
+"""
+Time building a large ToolCollection, and loading it back from a
+precompiled catalog.
+
+Usage: python benchmarks/bench_catalog.py [number of tools]
+"""
+import os
+import sys
+import tempfile
+import time
+import types
+import typing
+
+from llmfuncs import catalog
+from llmfuncs.tool import Tool, ToolCollection
+
+TEMPLATE = '''
+def tool_{i}(
+        query: str,
+        limit: int = 10,
+        filters: typing.Optional[typing.Dict[str, str]] = None,
+        rows: typing.List[typing.Dict[str, int]] = None,
+) -> typing.List[str]:
+    """
+    Search backend number {i}.
+
+    Args:
+        query (str): The search query for backend {i}.
+        limit (int, optional): Maximum number of results.
+        filters (Dict[str, str], optional): Field filters
+            applied before ranking.
+        rows (List[Dict[str, int]], optional): Extra rows to rank.
+
+    Returns:
+        List[str]: Matching document ids.
+    """
+    return []
+'''
+
+
+def make_functions(count: int) -> typing.List[typing.Callable]:
+    # Registered as a module so the catalog can import the tools back by path
+    module = sys.modules["bench_tools"] = types.ModuleType("bench_tools")
+    module.typing = typing
+    exec("".join(TEMPLATE.format(i=i) for i in range(count)), module.__dict__)
+    return [getattr(module, f"tool_{i}") for i in range(count)]
+
+
+def main(count: int = 10_000):
+    functions = make_functions(count)
+    start = time.perf_counter()
+    collection = ToolCollection([Tool(func) for func in functions])
+    elapsed = time.perf_counter() - start
+    print(f"Built {len(collection)} tools in {elapsed:.3f}s "
+          f"({elapsed / count * 1e6:.1f}us per tool)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tools.cat")
+        catalog.build_catalog(collection, path)
+        start = time.perf_counter()
+        compiled = catalog.Catalog(path)
+        loaded = compiled.collection()
+        loaded_at = time.perf_counter()
+        compiled.schema_json()
+        served_at = time.perf_counter()
+        loaded.use_tool("tool_0", {"query": "x"})
+        dispatched_at = time.perf_counter()
+        loaded.schema()
+        parsed_at = time.perf_counter()
+        loaded.schema()
+        repeated_at = time.perf_counter()
+        print(f"Loaded catalog in {(loaded_at - start) * 1e3:.1f}ms, "
+              f"schema_json() in {(served_at - loaded_at) * 1e3:.1f}ms, "
+              f"first call in {(dispatched_at - served_at) * 1e3:.1f}ms, "
+              f"schema() in {(parsed_at - dispatched_at) * 1e3:.1f}ms "
+              f"({(repeated_at - parsed_at) * 1e3:.1f}ms when repeated)")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
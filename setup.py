@@ -19,4 +19,7 @@ setup(
         "docstring-parser~=0.15",
         "jsonschema~=4.17.3",
     ],
+    extras_require={
+        "numpy": ["numpy"],
+    },
 )
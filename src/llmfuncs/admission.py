@@ -0,0 +1,221 @@
+import asyncio
+import collections
+import contextlib
+import threading
+import typing
+
+from . import context
+
+
+class ToolOverloadedError(RuntimeError):
+    """Raised when a tool is saturated and cannot admit another call."""
+
+
+class _Waiter:
+    """A queued call waiting for a slot, woken from whichever thread releases."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None):
+        self.granted = False
+        self._loop = loop
+        if loop is None:
+            self._event = threading.Event()
+        else:
+            self._future = loop.create_future()
+
+    def wake(self):
+        if self._loop is None:
+            self._event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._set_future)
+
+    def _set_future(self):
+        if not self._future.done():
+            self._future.set_result(None)
+
+    def wait(self, timeout: typing.Optional[float]):
+        self._event.wait(timeout)
+
+    async def wait_async(self, timeout: typing.Optional[float]):
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._future, timeout)
+
+
+class AdmissionLimiter:
+    """
+    Bounds the number of concurrent calls to a tool.
+
+    Up to ``max_concurrency`` calls run at once. Further calls wait in a FIFO
+    queue of at most ``max_queue`` entries for up to ``queue_timeout`` seconds;
+    calls that find the queue full, or time out while waiting, are rejected
+    with ``ToolOverloadedError``. The same limiter can be shared by threads and
+    asyncio tasks.
+    """
+
+    def __init__(
+            self,
+            max_concurrency: int,
+            max_queue: int = 0,
+            queue_timeout: typing.Optional[float] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._lock = threading.Lock()
+        self._waiters: typing.Deque[_Waiter] = collections.deque()
+        self._active = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+
+    def _try_acquire(self, waiter_factory) -> typing.Optional[_Waiter]:
+        """Take a slot if one is free, otherwise enqueue a waiter or reject."""
+        with self._lock:
+            if self._active < self.max_concurrency and not self._waiters:
+                self._active += 1
+                self._admitted += 1
+                return None
+            if len(self._waiters) >= self.max_queue:
+                self._rejected += 1
+                raise ToolOverloadedError(
+                    f"Tool is saturated: {self._active} running, "
+                    f"{len(self._waiters)} queued")
+            waiter = waiter_factory()
+            self._waiters.append(waiter)
+            return waiter
+
+    def _abandon(self, waiter: _Waiter, timed_out: bool):
+        """Give up waiting; returns True if the slot was granted meanwhile."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            if timed_out:
+                self._timed_out += 1
+            return False
+
+    def _timeout(
+            self,
+            timeout: typing.Optional[float],
+            call_context: typing.Optional[context.CallContext],
+    ) -> typing.Optional[float]:
+        timeouts = [timeout, self.queue_timeout]
+        if call_context is not None:
+            timeouts.append(call_context.remaining())
+        timeouts = [t for t in timeouts if t is not None]
+        return min(timeouts) if timeouts else None
+
+    @staticmethod
+    def _watch(
+            waiter: _Waiter,
+            call_context: typing.Optional[context.CallContext],
+    ) -> typing.Callable[[], None]:
+        """Wake the waiter as soon as the call is cancelled."""
+        if call_context is None:
+            return lambda: None
+        return call_context.add_callback(waiter.wake)
+
+    def _finish_wait(
+            self,
+            waiter: _Waiter,
+            call_context: typing.Optional[context.CallContext],
+    ):
+        # A call whose own deadline or cancellation ended the wait is not an
+        # overload, so it is neither counted nor reported as one
+        stopped = call_context is not None and call_context.done()
+        if self._abandon(waiter, timed_out=not stopped):
+            return
+        if stopped:
+            call_context.check()
+        raise ToolOverloadedError("Timed out waiting for a free slot")
+
+    def acquire(
+            self,
+            timeout: typing.Optional[float] = None,
+            call_context: context.CallContext = None,
+    ):
+        """
+        Block the calling thread until a slot is free. A ``call_context`` that
+        is cancelled or expires while queued ends the wait with its own error.
+        """
+        waiter = self._try_acquire(_Waiter)
+        if waiter is None:
+            return
+        unregister = self._watch(waiter, call_context)
+        try:
+            waiter.wait(self._timeout(timeout, call_context))
+        finally:
+            unregister()
+        self._finish_wait(waiter, call_context)
+
+    async def acquire_async(
+            self,
+            timeout: typing.Optional[float] = None,
+            call_context: context.CallContext = None,
+    ):
+        """Wait for a free slot without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        waiter = self._try_acquire(lambda: _Waiter(loop))
+        if waiter is None:
+            return
+        unregister = self._watch(waiter, call_context)
+        try:
+            await waiter.wait_async(self._timeout(timeout, call_context))
+        except BaseException:
+            # Cancelled while queued: hand back a slot granted in the meantime
+            if self._abandon(waiter, timed_out=False):
+                self.release()
+            raise
+        finally:
+            unregister()
+        self._finish_wait(waiter, call_context)
+
+    def release(self):
+        """Free a slot, handing it directly to the oldest waiter if there is one."""
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                self._admitted += 1
+                waiter.wake()
+            else:
+                self._active -= 1
+
+    @contextlib.contextmanager
+    def admit(
+            self,
+            timeout: typing.Optional[float] = None,
+            call_context: context.CallContext = None,
+    ):
+        self.acquire(timeout, call_context)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @contextlib.asynccontextmanager
+    async def admit_async(
+            self,
+            timeout: typing.Optional[float] = None,
+            call_context: context.CallContext = None,
+    ):
+        await self.acquire_async(timeout, call_context)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Snapshot of live load and cumulative admission counters."""
+        with self._lock:
+            return {
+                "active": self._active,
+                "queue_depth": len(self._waiters),
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+            }
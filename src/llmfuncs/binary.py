@@ -0,0 +1,182 @@
+import base64
+import binascii
+import math
+import typing
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    numpy = None
+
+BufferMapping = typing.Mapping[str, typing.Any]
+
+# A binary value is either inline base64 text or a reference to a buffer
+# passed alongside the JSON arguments, e.g. {"buffer": "image"}.
+BUFFER_REF_SCHEMA = {
+    "type": "object",
+    "properties": {"buffer": {"type": "string"}},
+    "required": ["buffer"],
+    "additionalProperties": False,
+}
+
+BYTES_SCHEMA = {
+    "anyOf": [
+        {"type": "string", "contentEncoding": "base64"},
+        BUFFER_REF_SCHEMA,
+    ],
+}
+
+
+def is_ndarray_type(py_type: typing.Any) -> bool:
+    if numpy is None:
+        return False
+    return py_type is numpy.ndarray or typing.get_origin(py_type) is numpy.ndarray
+
+
+def _ndarray_dtype(py_type: typing.Any) -> typing.Optional[str]:
+    """Return the dtype fixed by an ``NDArray[...]`` annotation, if any."""
+    args = typing.get_args(py_type)
+    if len(args) != 2:
+        return None
+    dtype_args = typing.get_args(args[1])
+    if not dtype_args:
+        return None
+    scalar_type = dtype_args[0]
+    # TypeVars (bare NDArray) and abstract types such as numpy.floating pin nothing
+    if not isinstance(scalar_type, type) or not issubclass(scalar_type, numpy.generic):
+        return None
+    try:
+        dtype = numpy.dtype(scalar_type)
+    except TypeError:
+        return None
+    return dtype.str if dtype.type is scalar_type else None
+
+
+def ndarray_schema(py_type: typing.Any) -> typing.Dict[str, typing.Any]:
+    dtype = _ndarray_dtype(py_type)
+    dtype_schema = {"type": "string"}
+    if dtype is not None:
+        dtype_schema["enum"] = [dtype, numpy.dtype(dtype).name]
+    return {
+        "type": "object",
+        "properties": {
+            "dtype": dtype_schema,
+            "shape": {"type": "array", "items": {"type": "integer", "minimum": 0}},
+            "data": BYTES_SCHEMA,
+        },
+        "required": ["dtype", "shape", "data"],
+    }
+
+
+def encode_bytes(data: typing.Any) -> str:
+    """Encode a bytes-like object as base64 text for use in JSON arguments."""
+    return base64.b64encode(data).decode("ascii")
+
+
+def decode_bytes(
+        value: typing.Any,
+        buffers: typing.Optional[BufferMapping] = None,
+) -> memoryview:
+    """Decode a base64 string or buffer reference into a memoryview."""
+    if isinstance(value, dict):
+        name = value["buffer"]
+        if not buffers or name not in buffers:
+            raise ValueError(f"Missing sidecar buffer '{name}'")
+        return memoryview(buffers[name]).cast("B")
+    try:
+        return memoryview(base64.b64decode(value, validate=True))
+    except binascii.Error as e:
+        raise ValueError(f"Failed to decode base64 data: {e}")
+
+
+def encode_value(value: typing.Any) -> typing.Any:
+    """JSON form of a bytes-like or array value, e.g. for a schema default."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return encode_bytes(value)
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        return encode_array(value)
+    return value
+
+
+def encode_array(array: typing.Any) -> typing.Dict[str, typing.Any]:
+    """Encode a NumPy array as ``{"dtype", "shape", "data"}`` JSON arguments."""
+    array = numpy.ascontiguousarray(array)
+    return {
+        "dtype": array.dtype.str,
+        "shape": list(array.shape),
+        "data": encode_bytes(array.data),
+    }
+
+
+def decode_array(
+        value: typing.Mapping[str, typing.Any],
+        buffers: typing.Optional[BufferMapping] = None,
+) -> typing.Any:
+    """Decode encoded array arguments into an ndarray view over the raw bytes.
+
+    Only the byte length is checked against the declared shape and dtype;
+    individual elements are never inspected.
+    """
+    try:
+        dtype = numpy.dtype(value["dtype"])
+    except TypeError as e:
+        raise ValueError(f"Invalid array dtype '{value['dtype']}': {e}")
+    shape = tuple(value["shape"])
+    data = decode_bytes(value["data"], buffers)
+    expected = math.prod(shape) * dtype.itemsize
+    if data.nbytes != expected:
+        raise ValueError(
+            f"Array data has {data.nbytes} bytes, expected {expected} "
+            f"for shape {shape} and dtype {dtype}")
+    return numpy.frombuffer(data, dtype=dtype).reshape(shape)
+
+
+class ItemDecoder:
+    """Decodes the binary items of a list, or the values of a dict."""
+
+    def __init__(self, container: type, decoder: typing.Callable):
+        self.container = container
+        self.decoder = decoder
+
+    def _decode(self, value: typing.Any, buffers: typing.Optional[BufferMapping]):
+        return None if value is None else self.decoder(value, buffers)
+
+    def __call__(self, value: typing.Any, buffers: typing.Optional[BufferMapping] = None):
+        if self.container is dict:
+            return {key: self._decode(item, buffers) for key, item in value.items()}
+        return [self._decode(item, buffers) for item in value]
+
+
+_decoder_cache: typing.Dict[typing.Any, typing.Optional[typing.Callable]] = {}
+
+
+def get_decoder(py_type: typing.Any) -> typing.Optional[typing.Callable]:
+    """Return the decoder for a binary parameter type, or None for other types."""
+    try:
+        return _decoder_cache[py_type]
+    except KeyError:
+        decoder = _decoder_cache[py_type] = _get_decoder(py_type)
+        return decoder
+    except TypeError:
+        return _get_decoder(py_type)
+
+
+def _get_decoder(py_type: typing.Any) -> typing.Optional[typing.Callable]:
+    origin = typing.get_origin(py_type)
+    args = typing.get_args(py_type)
+    if origin is typing.Union and len(args) == 2 and type(None) in args:
+        # Optional[bytes] and friends decode the same way, passing None through
+        py_type = args[0]
+    if py_type is bytes:
+        return decode_bytes
+    if is_ndarray_type(py_type):
+        return decode_array
+    origin = typing.get_origin(py_type)
+    args = typing.get_args(py_type)
+    if origin is list and args:
+        decoder = get_decoder(args[0])
+        return ItemDecoder(list, decoder) if decoder else None
+    if origin is dict and len(args) == 2:
+        decoder = get_decoder(args[1])
+        return ItemDecoder(dict, decoder) if decoder else None
+    return None
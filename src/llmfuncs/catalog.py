@@ -0,0 +1,269 @@
+import contextlib
+import gc
+import importlib
+import json
+import mmap
+import os
+import pathlib
+import pickle
+import struct
+import tempfile
+import typing
+
+from . import binary, schema
+from .tool import Tool, ToolCollection
+
+# A catalog file is an 8 byte magic, the format version and the length of the
+# JSON index as little-endian uint32s, the index, and then the blobs the index
+# points at by (offset, length) relative to the end of the index. Blobs are
+# JSON, except for a pickle of the collection schema which loads faster.
+MAGIC = b"LLMFCAT\x00"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<II")
+
+_CODECS = {
+    "bytes": binary.decode_bytes,
+    "ndarray": binary.decode_array,
+}
+_CODEC_NAMES = {decoder: name for name, decoder in _CODECS.items()}
+
+
+def _codec_spec(decoder: typing.Callable) -> typing.Any:
+    """A JSON description of a binary decoder, e.g. ["list", "bytes"]."""
+    if isinstance(decoder, binary.ItemDecoder):
+        return [decoder.container.__name__, _codec_spec(decoder.decoder)]
+    return _CODEC_NAMES[decoder]
+
+
+def _codec(spec: typing.Any) -> typing.Callable:
+    if isinstance(spec, list):
+        container, item_spec = spec
+        return binary.ItemDecoder({"list": list, "dict": dict}[container], _codec(item_spec))
+    return _CODECS[spec]
+
+
+def _import_path(func: typing.Callable) -> str:
+    """
+    The path a worker imports ``func`` by, checked to lead back to ``func``
+    so that a catalog that cannot be loaded fails when it is built.
+    """
+    qualname = func.__qualname__
+    if "<locals>" in qualname or "<lambda>" in qualname:
+        raise ValueError(f"Function '{qualname}' cannot be imported by path")
+    if func.__module__ == "__main__":
+        raise ValueError(
+            f"Function '{qualname}' is defined in __main__, which other "
+            f"processes cannot import; move it to a module")
+    import_path = f"{func.__module__}:{qualname}"
+    if _resolve(import_path) is not func:
+        raise ValueError(f"'{import_path}' does not import function '{qualname}'")
+    return import_path
+
+
+def _resolve(import_path: str) -> typing.Callable:
+    module_name, qualname = import_path.split(":")
+    try:
+        target = importlib.import_module(module_name)
+        for attr in qualname.split("."):
+            target = getattr(target, attr)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"Cannot import tool function '{import_path}': {e}")
+    return target
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """Pause the cyclic GC, which would otherwise rescan every new schema dict."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _publish(tmp_path: str, path: pathlib.Path):
+    """Give the file the permissions of a normal new file and move it into place."""
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(tmp_path, 0o666 & ~umask)
+    os.replace(tmp_path, path)
+
+
+def build_catalog(
+        collection: ToolCollection,
+        path: str | pathlib.Path,
+        version: str = None,
+):
+    """
+    Compile a collection into a catalog file at ``path``.
+
+    The catalog holds each tool's schema, the serialized schema of the whole
+    collection and the import path of every function, so that
+    ``load_catalog`` can serve schemas and dispatch calls without
+    introspecting any function. The file is written next to its destination
+    and moved into place, so workers that already mapped an older catalog are
+    not affected. ``version`` is stored for callers to check with
+    ``Catalog.version``. Only load catalogs you trust: they name functions to
+    import and hold pickled data.
+    """
+    blobs = bytearray()
+
+    def add_blob(value: typing.Any, as_pickle: bool = False) -> typing.List[int]:
+        if as_pickle:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            data = json.dumps(value).encode("utf-8")
+        offset = len(blobs)
+        blobs.extend(data)
+        return [offset, len(data)]
+
+    entries = []
+    for name, tool in collection._tools.items():
+        entries.append({
+            "name": name,
+            "function": _import_path(tool._func),
+            "is_async": tool.is_async(),
+            "context_param": tool._context_param,
+            "codecs": {param: _codec_spec(decoder)
+                       for param, decoder in tool._decoders.items()},
+            "schema": add_blob(dict(tool.schema(), name=name)),
+        })
+    collection_schema = collection.schema()
+    index = {
+        "version": version,
+        "schema": add_blob(collection_schema),
+        "schema_pickle": add_blob(collection_schema, as_pickle=True),
+        "tools": entries,
+    }
+    index_data = json.dumps(index).encode("utf-8")
+
+    path = pathlib.Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER.pack(FORMAT_VERSION, len(index_data)))
+            f.write(index_data)
+            f.write(blobs)
+        _publish(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class Catalog:
+    """
+    A memory-mapped catalog file. Workers that map the same file share its
+    pages, and only the small index is parsed on load.
+    """
+
+    def __init__(self, path: str | pathlib.Path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header_size = len(MAGIC) + _HEADER.size
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a tool catalog: {path}")
+        format_version, index_size = _HEADER.unpack(self._mmap[len(MAGIC):header_size])
+        if format_version != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported catalog format {format_version}, expected {FORMAT_VERSION}")
+        with _gc_paused():
+            self._index = json.loads(self._mmap[header_size:header_size + index_size])
+        self._blobs_start = header_size + index_size
+
+    @property
+    def version(self) -> typing.Optional[str]:
+        return self._index["version"]
+
+    def blob(self, location: typing.Sequence[int]) -> bytes:
+        offset, length = location
+        start = self._blobs_start + offset
+        return self._mmap[start:start + length]
+
+    def schema_json(self) -> bytes:
+        """The whole collection's schema, already serialized as JSON."""
+        return self.blob(self._index["schema"])
+
+    def schema(self) -> typing.List[schema.JsonSchema]:
+        """The whole collection's schema, parsed from the mapped file."""
+        with _gc_paused():
+            return pickle.loads(self.blob(self._index["schema_pickle"]))
+
+    def collection(self, **kwargs) -> "CatalogCollection":
+        """A ToolCollection of lazily resolved tools; kwargs go to its constructor."""
+        return CatalogCollection(self, **kwargs)
+
+    def close(self):
+        self._mmap.close()
+
+
+class CompiledTool(Tool):
+    """
+    A Tool restored from a catalog. Its schema is read from the mapped file
+    when first needed and its function is imported on first call.
+    """
+
+    def __init__(self, catalog: Catalog, entry: typing.Mapping[str, typing.Any]):
+        self._catalog = catalog
+        self._entry = entry
+        self._resolved: typing.Optional[typing.Callable] = None
+        self._schema: typing.Optional[schema.JsonSchema] = None
+        self._limiter = None
+        self._context_param = entry["context_param"]
+        self._decoders = {param: _codec(codec) for param, codec in entry["codecs"].items()}
+
+    @property
+    def _func(self) -> typing.Callable:
+        if self._resolved is None:
+            self._resolved = _resolve(self._entry["function"])
+        return self._resolved
+
+    def name(self) -> str:
+        return self._entry["function"].split(":")[-1].rsplit(".", 1)[-1]
+
+    def is_async(self) -> bool:
+        return self._entry["is_async"]
+
+    def schema(self):
+        if self._schema is None:
+            self._schema = json.loads(self._catalog.blob(self._entry["schema"]))
+        # A fresh top-level dict, as Tool.schema returns
+        return dict(self._schema)
+
+
+class CatalogCollection(ToolCollection):
+    """
+    A ToolCollection loaded from a catalog. Until other tools are added, its
+    schema is parsed once from the catalog's stored collection schema rather
+    than tool by tool.
+    """
+
+    def __init__(self, catalog: Catalog, tools: typing.List[Tool] = None, **kwargs):
+        super().__init__(**kwargs)
+        self._catalog = catalog
+        self._schemas: typing.Optional[typing.List[schema.JsonSchema]] = None
+        for entry in catalog._index["tools"]:
+            self._tools[entry["name"]] = CompiledTool(catalog, entry)
+        self._precompiled = True
+        for tool in tools or []:
+            self.add_tool(tool)
+
+    def add_tool(self, tool: Tool, namespace: str = None, replace: bool = False):
+        super().add_tool(tool, namespace, replace)
+        self._precompiled = False
+
+    def schema(self) -> typing.List[schema.JsonSchema]:
+        if not self._precompiled:
+            return super().schema()
+        if self._schemas is None:
+            self._schemas = self._catalog.schema()
+            for tool, tool_schema in zip(self._tools.values(), self._schemas):
+                tool._schema = tool_schema
+        return [dict(tool_schema) for tool_schema in self._schemas]
+
+
+def load_catalog(path: str | pathlib.Path, **kwargs) -> CatalogCollection:
+    """Load a catalog file as a ToolCollection; kwargs go to its constructor."""
+    return Catalog(path).collection(**kwargs)
@@ -0,0 +1,107 @@
+import threading
+import time
+import typing
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a call's deadline passes before or while it runs."""
+
+
+class ToolCancelledError(RuntimeError):
+    """Raised when a call is cancelled through its CallContext."""
+
+
+class CallContext:
+    """
+    Deadline and cancellation state for one tool call.
+
+    Pass it to ``ToolCollection.use_tool`` or ``use_tool_async``. Tools that
+    declare a parameter annotated with ``CallContext`` receive it, and that
+    parameter is left out of the tool's schema. Synchronous tools cooperate by
+    calling ``check()`` or ``wait()``; async tools are cancelled as tasks.
+    """
+
+    def __init__(self, timeout: float = None, deadline: float = None):
+        """
+        Args:
+            timeout: Seconds from now until the deadline.
+            deadline: Absolute deadline on the ``time.monotonic()`` clock.
+        """
+        if timeout is not None:
+            timeout_deadline = time.monotonic() + timeout
+            deadline = timeout_deadline if deadline is None else min(deadline, timeout_deadline)
+        self.deadline = deadline
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: typing.List[typing.Callable[[], None]] = []
+
+    def remaining(self) -> typing.Optional[float]:
+        """Seconds left until the deadline, or None if there is no deadline."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def done(self) -> bool:
+        """Whether the call should stop, by cancellation or deadline."""
+        return self.cancelled() or self.expired()
+
+    def check(self):
+        """Raise if the call has been cancelled or its deadline has passed."""
+        if self.cancelled():
+            raise ToolCancelledError("Tool call was cancelled")
+        if self.expired():
+            raise DeadlineExceededError("Tool call deadline exceeded")
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Sleep for up to ``timeout`` seconds, waking early on cancellation.
+        Returns True if the call was cancelled.
+        """
+        remaining = self.remaining()
+        if remaining is not None:
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return self._cancelled.wait(timeout)
+
+    def cancel(self):
+        """Cancel the call; running async tools get their task cancelled."""
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self._cancelled.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: typing.Callable[[], None]) -> typing.Callable[[], None]:
+        """
+        Run ``callback`` once on cancellation, immediately if already cancelled.
+        Returns a function that unregisters it.
+        """
+        with self._lock:
+            if not self._cancelled.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: typing.Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+def is_context_type(py_type: typing.Any) -> bool:
+    """Whether an annotation asks for the CallContext, optionally Optional."""
+    if py_type is CallContext:
+        return True
+    if typing.get_origin(py_type) is not typing.Union:
+        return False
+    args = typing.get_args(py_type)
+    return (typing.get_origin(py_type) is typing.Union and len(args) == 2
+            and CallContext in args and type(None) in args)
@@ -0,0 +1,167 @@
+import functools
+import inspect
+import re
+import typing
+
+import docstring_parser
+from docstring_parser import google
+
+# The patterns below match from the newline before a line, which re finds
+# much faster than a multiline ``^``; search "\n" + text to include line one.
+
+# Markers of the reST, Epydoc and NumPy docstring styles
+_NON_GOOGLE_STYLE = re.compile(r"\n[ \t\r\f\v]*(?::\w|@\w|-{3,}[ \t\r\f\v]*(?=\n|\Z))")
+
+_GOOGLE_TITLES = {section.title for section in google.DEFAULT_SECTIONS}
+# Only lines that hold nothing but a known section title start a section
+_TITLE = re.compile(
+    r"\n(%s):[ \t\r\f\v]*(?=\n|\Z)" % "|".join(map(re.escape, sorted(_GOOGLE_TITLES))))
+_UNINDENTED = re.compile(r"\n\S")
+
+# Sections handled by the fast path, with their docstring_parser keys
+_FAST_SECTIONS = {
+    "Args": "param",
+    "Arguments": "param",
+    "Params": "param",
+    "Parameters": "param",
+    "Returns": "returns",
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_docstring(doc: str) -> docstring_parser.Docstring:
+    """
+    Parse a docstring as returned by ``inspect.getdoc``.
+
+    Results are shared between identical docstrings, so callers must not
+    modify them. Google style docstrings with only description, argument and
+    return sections take a fast path; anything else goes to docstring_parser.
+    """
+    if _NON_GOOGLE_STYLE.search("\n" + doc):
+        return docstring_parser.parse(doc)
+    parsed = _parse_google_fast(doc)
+    if parsed is None:
+        return docstring_parser.parse(doc)
+    return parsed
+
+
+def _parse_google_fast(text: str) -> typing.Optional[docstring_parser.Docstring]:
+    """
+    Parse a cleaned Google style docstring exactly as ``google.parse`` would,
+    or return None if it has anything besides the sections handled here.
+    """
+    if _TITLE.match("\n" + text):
+        # google.parse cannot parse a docstring without a description
+        return None
+    titles = list(_TITLE.finditer(text))
+    if any(match.group(1) not in _FAST_SECTIONS for match in titles):
+        return None
+
+    ret = docstring_parser.Docstring(style=docstring_parser.DocstringStyle.GOOGLE)
+    # Sections start one past the matched newline
+    desc_chunk = text[:titles[0].start() + 1] if titles else text
+    parts = desc_chunk.split("\n", 1)
+    ret.short_description = parts[0] or None
+    if len(parts) > 1:
+        ret.blank_after_short_description = parts[1].startswith("\n")
+        ret.blank_after_long_description = parts[1].endswith("\n\n")
+        ret.long_description = parts[1].strip() or None
+
+    ends = [match.start() + 1 for match in titles[1:]] + [len(text)]
+    for match, end in zip(titles, ends):
+        details = text[match.end():end]
+        if _UNINDENTED.search(details):
+            # google.parse silently drops unindented text inside a section
+            return None
+        chunk = details.strip("\n")
+        key = _FAST_SECTIONS[match.group(1)]
+        if key == "returns":
+            meta = _build_returns(_cleandoc(chunk))
+            if meta is None:
+                return None
+            ret.meta.append(meta)
+            continue
+
+        indent = chunk[:len(chunk) - len(chunk.lstrip())]
+        if not chunk.strip() or "\n" in indent:
+            return None
+        for item in _item_start(indent).split(chunk):
+            meta = _build_param(item[len(indent):].strip("\n"), key)
+            if meta is None:
+                return None
+            ret.meta.append(meta)
+    return ret
+
+
+@functools.lru_cache(maxsize=None)
+def _item_start(indent: str) -> re.Pattern:
+    """Matches where an item starts: a line indented exactly like the first."""
+    return re.compile(f"\n(?={indent}\\S)")
+
+
+def _cleandoc(text: str) -> str:
+    if "\n" not in text:
+        # inspect.cleandoc of a single line only strips its leading whitespace
+        return text.expandtabs().lstrip()
+    return inspect.cleandoc(text)
+
+
+def _split_item(text: str) -> typing.Optional[typing.Tuple[str, str]]:
+    if ":" not in text:
+        return None
+    before, desc = text.split(":", 1)
+    if "\n" in before:
+        return None
+    if desc:
+        desc = desc[1:] if desc[0] == " " else desc
+        if "\n" in desc:
+            first_line, rest = desc.split("\n", 1)
+            desc = first_line + "\n" + _cleandoc(rest)
+        desc = desc.strip("\n")
+    return before, desc
+
+
+# Argument descriptions repeat across functions (``query``, ``limit``, ...),
+# and the parsed parameters are shared like whole docstrings
+@functools.lru_cache(maxsize=8192)
+def _build_param(text: str, key: str) -> typing.Optional[docstring_parser.DocstringParam]:
+    split = _split_item(text)
+    if split is None:
+        return None
+    before, desc = split
+    match = google.GOOGLE_TYPED_ARG_REGEX.match(before)
+    if match:
+        arg_name, type_name = match.group(1, 2)
+        if type_name.endswith(", optional"):
+            is_optional = True
+            type_name = type_name[:-10]
+        elif type_name.endswith("?"):
+            is_optional = True
+            type_name = type_name[:-1]
+        else:
+            is_optional = False
+    else:
+        arg_name, type_name = before, None
+        is_optional = None
+    match = google.GOOGLE_ARG_DESC_REGEX.match(desc)
+    return docstring_parser.DocstringParam(
+        args=[key, before],
+        description=desc,
+        arg_name=arg_name,
+        type_name=type_name,
+        is_optional=is_optional,
+        default=match.group(1) if match else None,
+    )
+
+
+@functools.lru_cache(maxsize=8192)
+def _build_returns(text: str) -> typing.Optional[docstring_parser.DocstringReturns]:
+    if not google.MULTIPLE_PATTERN.match(text):
+        return docstring_parser.DocstringReturns(
+            args=["returns"], description=text, type_name=None, is_generator=False)
+    split = _split_item(text)
+    if split is None:
+        return None
+    before, desc = split
+    return docstring_parser.DocstringReturns(
+        args=["returns", before], description=desc, type_name=before, is_generator=False)
@@ -0,0 +1,184 @@
+import contextlib
+import cProfile
+import glob
+import inspect
+import io
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+import typing
+
+
+class ToolProfile:
+    """Aggregated profile of the sampled calls to one tool."""
+
+    def __init__(self):
+        self.samples = 0
+        self.total_time = 0.0
+        self.net_allocated = 0
+        self.peak_allocated = 0
+        self.stats: typing.Optional[pstats.Stats] = None
+
+    def add(
+            self,
+            profile: cProfile.Profile,
+            elapsed: float,
+            net: int,
+            peak: typing.Optional[int],
+    ):
+        self.samples += 1
+        self.total_time += elapsed
+        self.net_allocated += net
+        if peak is not None:
+            self.peak_allocated = max(self.peak_allocated, peak)
+        if self.stats is None:
+            self.stats = pstats.Stats(profile)
+        else:
+            self.stats.add(profile)
+
+    def summary(self, limit: int = 20) -> typing.Dict[str, typing.Any]:
+        text = io.StringIO()
+        if self.stats is not None:
+            self.stats.stream = text
+            self.stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return {
+            "samples": self.samples,
+            "total_time": self.total_time,
+            "net_allocated": self.net_allocated,
+            "peak_allocated": self.peak_allocated,
+            "top_functions": text.getvalue(),
+        }
+
+
+# Frames kept per allocation, so allocations made in helpers the tool calls
+# can still be traced back to the tool's source file
+_TRACEBACK_FRAMES = 16
+
+
+def _source_file(func: typing.Optional[typing.Callable]) -> typing.Optional[str]:
+    code = getattr(inspect.unwrap(func), "__code__", None) if func else None
+    return code.co_filename if code else None
+
+
+def _allocated_in(
+        filename: str,
+        snapshot: tracemalloc.Snapshot,
+        baseline: typing.Optional[tracemalloc.Snapshot],
+) -> int:
+    """Net size of the traced blocks allocated with ``filename`` on the stack."""
+    filters = [tracemalloc.Filter(True, glob.escape(filename), all_frames=True)]
+    snapshot = snapshot.filter_traces(filters)
+    if baseline is None:
+        return sum(stat.size for stat in snapshot.statistics("filename"))
+    baseline = baseline.filter_traces(filters)
+    return sum(stat.size_diff for stat in snapshot.compare_to(baseline, "filename"))
+
+
+class Profiler:
+    """
+    Samples tool calls with cProfile and tracemalloc and aggregates the
+    results per tool.
+
+    Each call is sampled with the rate set for its tool, falling back to the
+    default rate. Rates can be changed at any time from any thread. Only one
+    call is profiled at a time; a sampled call that overlaps another profiled
+    call runs unprofiled. Calls to coroutine tools are profiled around the
+    await, so their samples include other tasks that ran on the event loop
+    meanwhile.
+
+    tracemalloc traces the whole process. When the tool's function is known,
+    net allocations only count blocks allocated with a frame from the tool's
+    source file on the stack, which leaves out other threads and tasks unless
+    they run code from that same file. Peak memory cannot be filtered this
+    way and includes everything allocated during the call. It is only
+    recorded when the profiler started tracing itself, so tracing started
+    elsewhere keeps its own peak.
+    """
+
+    def __init__(self, rate: float = 0.0):
+        self._default_rate = rate
+        self._rates: typing.Dict[str, float] = {}
+        self._profiles: typing.Dict[str, ToolProfile] = {}
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+
+    def set_rate(self, rate: float, tool_name: str = None):
+        """Set the sampling rate, between 0 and 1, for one tool or the default."""
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("Sampling rate must be between 0 and 1")
+        with self._lock:
+            if tool_name is None:
+                self._default_rate = rate
+            else:
+                self._rates[tool_name] = rate
+
+    def rate(self, tool_name: str) -> float:
+        return self._rates.get(tool_name, self._default_rate)
+
+    def _should_sample(self, tool_name: str) -> bool:
+        rate = self.rate(tool_name)
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+    @contextlib.contextmanager
+    def profile(self, tool_name: str, func: typing.Callable = None):
+        """
+        Profile the enclosed call if it is sampled and no other call is.
+        ``func`` is the tool's function, used to attribute allocations.
+        """
+        if not self._should_sample(tool_name) or not self._busy.acquire(blocking=False):
+            yield
+            return
+        filename = _source_file(func)
+        started_tracing = not tracemalloc.is_tracing()
+        baseline = None
+        if started_tracing:
+            tracemalloc.start(_TRACEBACK_FRAMES)
+        elif filename is not None:
+            baseline = tracemalloc.take_snapshot()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            profile = cProfile.Profile()
+            start = time.perf_counter()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                elapsed = time.perf_counter() - start
+                after, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot() if filename is not None else None
+                if started_tracing:
+                    # Stop before filtering the snapshot, or that gets traced too
+                    tracemalloc.stop()
+                if snapshot is not None:
+                    net = _allocated_in(filename, snapshot, baseline)
+                else:
+                    net = after - before
+                with self._lock:
+                    tool_profile = self._profiles.setdefault(tool_name, ToolProfile())
+                    tool_profile.add(profile, elapsed, net,
+                                     peak - before if started_tracing else None)
+        finally:
+            if started_tracing and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self._busy.release()
+
+    def dump(self, limit: int = 20) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """Summaries of every profiled tool, with the top ``limit`` functions."""
+        with self._lock:
+            return {name: profile.summary(limit)
+                    for name, profile in self._profiles.items()}
+
+    def dump_stats(self, tool_name: str, path: str):
+        """Write a tool's aggregated cProfile stats to a file readable by pstats."""
+        with self._lock:
+            profile = self._profiles.get(tool_name)
+            if profile is None or profile.stats is None:
+                raise ValueError(f"No profile recorded for tool: {tool_name}")
+            profile.stats.dump_stats(path)
+
+    def reset(self):
+        with self._lock:
+            self._profiles.clear()
@@ -0,0 +1,188 @@
+import json
+import typing
+
+
+class ResultLimits:
+    """
+    Size limits for tool results sent back to the model.
+
+    Args:
+        max_bytes: Maximum size of the serialized result.
+        max_tokens: Maximum size in tokens, estimated as ``bytes_per_token``
+            bytes per token; the smaller of the two limits applies.
+        max_items: Maximum number of items kept from each list or dict.
+        max_string: Maximum number of characters kept from each string.
+        bytes_per_token: Bytes per token used to estimate ``max_tokens``.
+    """
+
+    def __init__(
+            self,
+            max_bytes: int = None,
+            max_tokens: int = None,
+            max_items: int = None,
+            max_string: int = None,
+            bytes_per_token: float = 4.0,
+    ):
+        self.max_bytes = max_bytes
+        self.max_tokens = max_tokens
+        self.max_items = max_items
+        self.max_string = max_string
+        self.bytes_per_token = bytes_per_token
+
+    def byte_budget(self) -> typing.Optional[int]:
+        budgets = [self.max_bytes]
+        if self.max_tokens is not None:
+            budgets.append(int(self.max_tokens * self.bytes_per_token))
+        budgets = [budget for budget in budgets if budget is not None]
+        return min(budgets) if budgets else None
+
+
+class _Overflow(Exception):
+    pass
+
+
+class _BoundedWriter:
+    """
+    Writes JSON piece by piece and stops once the byte budget is reached,
+    closing open containers with a marker instead of emitting invalid JSON.
+    Output is ASCII (non-ASCII is escaped), so characters and bytes coincide.
+
+    Only room for the closing brackets of open containers is kept free while
+    writing; when an item does not fit, written items are rolled back until
+    the marker counting the dropped ones fits.
+    """
+
+    def __init__(self, limits: ResultLimits):
+        self.limits = limits
+        self.budget = limits.byte_budget()
+        self.parts: typing.List[str] = []
+        self.size = 0
+        self.exhausted = False
+
+    def _room(self, reserve: int) -> float:
+        if self.budget is None:
+            return float("inf")
+        return self.budget - self.size - reserve
+
+    def _write(self, text: str, reserve: int):
+        if len(text) > self._room(reserve):
+            raise _Overflow
+        self.parts.append(text)
+        self.size += len(text)
+
+    def _rollback(self, checkpoint: typing.Tuple[int, int]):
+        count, size = checkpoint
+        del self.parts[count:]
+        self.size = size
+
+    def _string(self, value: str, reserve: int):
+        room = self._room(reserve)
+        cut = False
+        max_string = self.limits.max_string
+        if max_string is not None and len(value) > max_string:
+            value, cut = value[:max_string], True
+        if len(value) + 2 > room:
+            # Every character takes at least one byte, so cut before encoding
+            value, cut = value[:max(0, int(room) - 5)], True
+        encoded = json.dumps(value + "..." if cut else value)
+        while len(encoded) > room and value:
+            # Escapes made the text longer than its length suggested
+            value = value[:len(value) * 3 // 4]
+            encoded = json.dumps(value + "...")
+        self._write(encoded, reserve)
+
+    def value(self, value: typing.Any, reserve: int = 0) -> typing.Optional[int]:
+        """Write a value; for containers, returns how many items were kept."""
+        if isinstance(value, str):
+            self._string(value, reserve)
+        elif value is None or isinstance(value, (bool, int, float)):
+            self._write(json.dumps(value), reserve)
+        elif isinstance(value, dict):
+            return self._container("{", "}", value.items(), len(value), reserve, is_dict=True)
+        elif isinstance(value, (list, tuple)):
+            return self._container("[", "]", value, len(value), reserve, is_dict=False)
+        else:
+            self._string(str(value), reserve)
+        return None
+
+    def _container(self, open_, close, items, count, reserve, is_dict) -> int:
+        self._write(open_, reserve + len(close))
+        inner_reserve = reserve + len(close)
+        max_items = self.limits.max_items
+        checkpoints = []
+        for item in items:
+            if self.exhausted or (max_items is not None and len(checkpoints) >= max_items):
+                break
+            checkpoint = (len(self.parts), self.size)
+            try:
+                if checkpoints:
+                    self._write(", ", inner_reserve)
+                if is_dict:
+                    key, item = item
+                    self._write(json.dumps(str(key)) + ": ", inner_reserve)
+                kept = self.value(item, inner_reserve)
+            except _Overflow:
+                kept = 0
+                self.exhausted = True
+            if self.exhausted and kept == 0:
+                # Drop containers that ran out of room before their first item
+                self._rollback(checkpoint)
+                break
+            checkpoints.append(checkpoint)
+        if len(checkpoints) < count:
+            self._marker(count, checkpoints, is_dict, inner_reserve)
+        self._write(close, reserve)
+        return len(checkpoints)
+
+    def _marker(self, count: int, checkpoints: typing.List, is_dict: bool, reserve: int):
+        """Count the dropped items, dropping more of them until the marker fits."""
+        while True:
+            dropped = count - len(checkpoints)
+            separator = ", " if checkpoints else ""
+            if is_dict:
+                marker = f'{separator}"...": "{dropped} more keys"'
+            else:
+                marker = f'{separator}"... {dropped} more items"'
+            if len(marker) <= self._room(reserve):
+                self._write(marker, reserve)
+                return
+            if not checkpoints:
+                return
+            self._rollback(checkpoints.pop())
+
+
+def serialize_result(result: typing.Any, limits: ResultLimits = None) -> str:
+    """
+    Serialize a tool result to JSON text within the given limits.
+
+    Lists and dicts keep their first items and end with a marker counting the
+    ones dropped, long strings are cut, and serialization stops once the byte
+    budget is used, so a huge result is never encoded in full. String results
+    are returned as-is, cut to ``max_string`` and then to the budget.
+    """
+    if limits is None:
+        limits = ResultLimits()
+    if isinstance(result, str):
+        max_string = limits.max_string
+        if max_string is not None and len(result) > max_string:
+            result = result[:max_string] + "..."
+        budget = limits.byte_budget()
+        if budget is None:
+            return result
+        # UTF-8 takes at least a byte per character, so never encode past the budget
+        head = result[:budget].encode("utf-8")
+        if len(result) <= budget and len(head) <= budget:
+            return result
+        if budget < 3:
+            return head[:budget].decode("utf-8", "ignore")
+        return head[:budget - 3].decode("utf-8", "ignore") + "..."
+    if limits.byte_budget() is None and limits.max_items is None and limits.max_string is None:
+        return json.dumps(result, default=str)
+    writer = _BoundedWriter(limits)
+    try:
+        writer.value(result)
+    except _Overflow:
+        # Not even a truncated value fits; fall back to the shortest placeholder
+        budget = limits.byte_budget()
+        return next(text for text in ('"..."', '""', "") if len(text) <= budget)
+    return "".join(writer.parts)
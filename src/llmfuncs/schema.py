@@ -3,6 +3,8 @@ import typing
 
 import docstring_parser
 
+from . import binary
+
 JsonSchema = typing.Union[
     typing.Dict[str, "JSONType"],
     typing.List["JSONType"],
@@ -14,7 +16,64 @@ JsonSchema = typing.Union[
 ]
 
 
+class FrozenDict(dict):
+    """A read-only dict, so cached schemas can be shared between tools."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Shared schemas are read-only; copy them before modifying")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+class FrozenList(list):
+    """A read-only list, so cached schemas can be shared between tools."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Shared schemas are read-only; copy them before modifying")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+
+def freeze(value: JsonSchema) -> JsonSchema:
+    """Return a read-only copy of a schema, sharing already frozen parts."""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+_type_schema_cache: typing.Dict[typing.Any, JsonSchema] = {}
+
+
 def json_schema_type(py_type: typing.Any) -> JsonSchema:
+    """
+    Convert a Python type to its JSON schema type.
+
+    Results are cached per type and returned frozen, so the same subschema
+    object is shared by every parameter with that annotation.
+    """
+    try:
+        return _type_schema_cache[py_type]
+    except KeyError:
+        schema_type = _type_schema_cache[py_type] = freeze(_json_schema_type(py_type))
+        return schema_type
+    except TypeError:
+        # Unhashable annotations are converted every time
+        return freeze(_json_schema_type(py_type))
+
+
+def _json_schema_type(py_type: typing.Any) -> JsonSchema:
     mapping = {
         int: "integer",
         float: "number",
@@ -33,6 +92,12 @@ def json_schema_type(py_type: typing.Any) -> JsonSchema:
     if py_type is dict or py_type is typing.Dict:
         return {"type": "object", "additionalProperties": {}}
 
+    # Binary data travels as base64 text or a sidecar buffer reference
+    if py_type is bytes:
+        return binary.BYTES_SCHEMA
+    if binary.is_ndarray_type(py_type):
+        return binary.ndarray_schema(py_type)
+
     origin = typing.get_origin(py_type)
     args = typing.get_args(py_type)
 
@@ -65,33 +130,80 @@ def json_schema_type(py_type: typing.Any) -> JsonSchema:
     raise ValueError(f"Cannot convert {py_type} to a JSON schema type")
 
 
+_resolved_cache: typing.Dict[typing.Any, bool] = {}
+
+
+def _is_resolved(annotation: typing.Any) -> bool:
+    """Whether typing.get_type_hints would return an annotation unchanged."""
+    try:
+        return _resolved_cache[annotation]
+    except (KeyError, TypeError):
+        pass
+    origin = typing.get_origin(annotation)
+    if isinstance(annotation, (str, typing.ForwardRef)) or origin is typing.Annotated:
+        resolved = False
+    elif origin is typing.Literal:
+        resolved = True
+    else:
+        resolved = all(_is_resolved(arg) for arg in typing.get_args(annotation))
+    try:
+        _resolved_cache[annotation] = resolved
+    except TypeError:
+        pass
+    return resolved
+
+
+def get_type_hints(func: typing.Callable) -> typing.Dict[str, typing.Any]:
+    """
+    Equivalent to ``typing.get_type_hints`` for a function, but skips
+    evaluating annotations that contain no forward references.
+    """
+    annotations = getattr(func, "__annotations__", None)
+    if isinstance(annotations, dict) and all(map(_is_resolved, annotations.values())):
+        return {name: type(None) if annotation is None else annotation
+                for name, annotation in annotations.items()}
+    return typing.get_type_hints(func)
+
+
+def param_descriptions(doc_parsed: docstring_parser.Docstring) -> typing.Dict[str, str]:
+    """Descriptions by parameter name, taking the first of duplicate entries."""
+    descriptions = {}
+    for param in doc_parsed.params:
+        descriptions.setdefault(param.arg_name, param.description)
+    return descriptions
+
+
 def get_param_schema(
         param_name: str,
         param: inspect.Parameter,
         type_hints: typing.Dict[str, typing.Any],
         doc_parsed: docstring_parser.Docstring,
+        param_docs: typing.Mapping[str, str] = None,
 ) -> JsonSchema:
-    """Create a schema for a single parameter."""
+    """
+    Create a schema for a single parameter. ``param_docs`` maps parameter
+    names to descriptions, for callers that look up many parameters.
+    """
     if param_name not in type_hints:
         raise ValueError(f"Missing type hint for parameter '{param_name}'")
     param_type = type_hints[param_name]
     param_type_str = json_schema_type(param_type)
-    descriptions = (p.description for p in doc_parsed.params
-                    if p.arg_name == param_name)
-    param_doc = next(descriptions, None)
+    if param_docs is None:
+        param_docs = param_descriptions(doc_parsed)
+    param_doc = param_docs.get(param_name)
     if param_doc is None:
         raise ValueError(
             f"Missing description for parameter '{param_name}' in docstring")
 
-    # Check if the param_type_str is already a dictionary.
+    # Copy the shared type schema rather than adding keys to it
     if isinstance(param_type_str, dict):
-        param_schema = param_type_str
+        param_schema = dict(param_type_str)
     else:
         param_schema = {"type": param_type_str}
 
     param_schema["description"] = param_doc
 
     if param.default is not param.empty:
-        param_schema["default"] = param.default
+        param_schema["default"] = binary.encode_value(param.default)
 
     return param_schema
@@ -1,30 +1,40 @@
+import asyncio
+import collections
+import contextlib
 import glob
 import importlib.util
 import inspect
 import pathlib
 import pkgutil
+import re
 import types
 import typing
 
-import docstring_parser
-
-from . import schema, validator
+from . import admission, binary, context, docstrings, profiling, results, schema, validator
 
 
 class Tool:
-    def __init__(self, func: typing.Callable, include_return=False):
+    def __init__(
+            self,
+            func: typing.Callable,
+            include_return=False,
+            limiter: admission.AdmissionLimiter = None,
+    ):
         self._func = func
         self._include_return = include_return
+        self._limiter = limiter
 
         doc = inspect.getdoc(func)
         if not doc:
             raise ValueError(f"Missing docstring for function '{self.name()}'")
 
-        self._docstring = docstring_parser.parse(doc)
+        self._docstring = docstrings.parse_docstring(doc)
         self._signature = inspect.signature(func)
-        self._type_hints = typing.get_type_hints(func)
+        self._type_hints = schema.get_type_hints(func)
         self._params_schema = {}
         self._required_params = []
+        self._decoders: typing.Dict[str, typing.Callable] = {}
+        self._context_param: typing.Optional[str] = None
 
         self._parse_arguments()
 
@@ -32,14 +42,80 @@ class Tool:
         return self._func(*args, **kwargs)
 
     def _parse_arguments(self):
+        param_docs = schema.param_descriptions(self._docstring)
         for param_name, param in self._signature.parameters.items():
+            # The call context is supplied by the dispatcher, not the model
+            if context.is_context_type(self._type_hints.get(param_name)):
+                self._context_param = param_name
+                continue
             param_schema = schema.get_param_schema(
-                param_name, param, self._type_hints, self._docstring,
+                param_name, param, self._type_hints, self._docstring, param_docs,
             )
             self._params_schema[param_name] = param_schema
+            decoder = binary.get_decoder(self._type_hints[param_name])
+            if decoder is not None:
+                self._decoders[param_name] = decoder
             if param.default is param.empty:
                 self._required_params.append(param_name)
 
+    def decode_args(
+            self,
+            args: typing.Mapping[str, typing.Any],
+            buffers: binary.BufferMapping = None,
+    ) -> typing.Mapping[str, typing.Any]:
+        """Decode validated JSON arguments for binary parameters."""
+        if not self._decoders:
+            return args
+        decoded = dict(args)
+        for param_name, decoder in self._decoders.items():
+            value = decoded.get(param_name)
+            if value is not None:
+                decoded[param_name] = decoder(value, buffers)
+        return decoded
+
+    def bind_context(
+            self,
+            args: typing.Mapping[str, typing.Any],
+            call_context: typing.Optional[context.CallContext],
+    ) -> typing.Mapping[str, typing.Any]:
+        """Pass the call context to tools that declare a CallContext parameter."""
+        if self._context_param is None:
+            return args
+        bound = dict(args)
+        bound[self._context_param] = call_context or context.CallContext()
+        return bound
+
+    def validate_batch(
+            self,
+            records: typing.Iterable[typing.Mapping] | str | pathlib.Path,
+            chunk_size: int = 1024,
+    ) -> validator.BatchResult:
+        """Validate many argument sets, or a JSONL file of them, for this tool."""
+        return validator.validate_batch(
+            records, self.schema()["parameters"], chunk_size=chunk_size)
+
+    def is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self._func)
+
+    def set_limiter(self, limiter: typing.Optional[admission.AdmissionLimiter]):
+        """Set (or with None, remove) the admission limiter for this tool."""
+        self._limiter = limiter
+
+    def admission_stats(self) -> typing.Optional[typing.Dict[str, int]]:
+        return self._limiter.stats() if self._limiter else None
+
+    def admit(self, timeout: float = None, call_context: context.CallContext = None):
+        """Context manager holding an admission slot for one synchronous call."""
+        if self._limiter is None:
+            return contextlib.nullcontext()
+        return self._limiter.admit(timeout, call_context)
+
+    def admit_async(self, timeout: float = None, call_context: context.CallContext = None):
+        """Async context manager holding an admission slot for one call."""
+        if self._limiter is None:
+            return contextlib.nullcontext()
+        return self._limiter.admit_async(timeout, call_context)
+
     def _has_return(self):
         return self._signature.return_annotation is not self._signature.empty
 
@@ -66,33 +142,118 @@ class Tool:
         return func_schema
 
 
+# Function names sent to LLM APIs may only contain letters, digits, _ and -
+NAMESPACE_SEPARATOR = "__"
+
+
+def qualified_name(namespace: typing.Optional[str], name: str) -> str:
+    """Prefix a tool name with a module or tenant namespace."""
+    if not namespace:
+        return name
+    namespace = re.sub(r"[^a-zA-Z0-9_-]", "_", namespace)
+    return f"{namespace}{NAMESPACE_SEPARATOR}{name}"
+
+
 class ToolCollection:
-    def __init__(self, tools: typing.List[Tool] = None):
-        self._tools: typing.Dict[str, Tool] = {}
+    def __init__(
+            self,
+            tools: typing.List[Tool] = None,
+            result_limits: results.ResultLimits = None,
+    ):
+        self._tools: typing.MutableMapping[str, Tool] = {}
+        self._limiters: typing.MutableMapping[str, admission.AdmissionLimiter] = {}
+        self._profiler: typing.Optional[profiling.Profiler] = None
+        self._result_limits = result_limits
         for tool in tools or []:
             self.add_tool(tool)
 
     def __len__(self):
         return len(self._tools)
 
-    def add_tool(self, tool: Tool):
-        self._tools[tool.name()] = tool
+    def __contains__(self, tool_name: str):
+        return tool_name in self._tools
+
+    def add_tool(self, tool: Tool, namespace: str = None, replace: bool = False):
+        """
+        Add a tool under its function name, qualified by ``namespace`` if given.
+        Adding a different function under a name that is already taken raises
+        ValueError unless ``replace`` is set.
+        """
+        name = qualified_name(namespace, tool.name())
+        existing = self._tools.get(name)
+        if existing is not None and existing._func is not tool._func and not replace:
+            raise ValueError(
+                f"A different tool is already registered as '{name}'; "
+                f"use a namespace to keep both")
+        self._tools[name] = tool
+
+    def _view(
+            self,
+            tools: typing.MutableMapping[str, Tool],
+            others: typing.Sequence["ToolCollection"] = (),
+    ) -> "ToolCollection":
+        view = ToolCollection()
+        view._tools = tools
+        # Limits set on the view stay in its own layer
+        view._limiters = collections.ChainMap(
+            {}, self._limiters, *(other._limiters for other in others))
+        view._profiler = self._profiler
+        view._result_limits = self._result_limits
+        return view
+
+    def subset(self, tool_names: typing.Iterable[str]) -> "ToolCollection":
+        """A collection of just the named tools, sharing the same Tool objects."""
+        return self._view({name: self._get_tool(name) for name in tool_names})
+
+    def overlay(
+            self,
+            tools: typing.Iterable[Tool] = (),
+            namespace: str = None,
+    ) -> "ToolCollection":
+        """
+        A view of this collection with extra tools layered on top, e.g. for one
+        tenant. Overlay tools shadow base tools of the same name. Tools added
+        to the view later go to the overlay and never to this collection, while
+        tools added here later are visible through the view.
+        """
+        view = self._view(collections.ChainMap({}, self._tools))
+        for tool in tools:
+            view.add_tool(tool, namespace=namespace, replace=True)
+        return view
+
+    def union(self, *others: "ToolCollection") -> "ToolCollection":
+        """
+        A live view of this and other collections. Raises ValueError if two
+        collections hold different tools under the same name.
+        """
+        maps = [self._tools] + [other._tools for other in others]
+        for i, first in enumerate(maps):
+            for second in maps[i + 1:]:
+                smaller, larger = sorted((first, second), key=len)
+                for name in smaller:
+                    tool = larger.get(name)
+                    if tool is not None and tool is not smaller[name]:
+                        raise ValueError(f"Conflicting tools named '{name}'")
+        return self._view(collections.ChainMap({}, *maps), others)
 
     def add_tools_from_module(
             self,
             module: str | pathlib.Path | types.ModuleType,
             include_return: bool = False,
+            namespace: str = None,
     ):
         """
         Extracts function information from a Python module and formats it into a schema.
-        The function can accept either a module object or a string.
-        If a string is passed, it is considered a path and the function will attempt to
-        create a module object without executing the module's code.
+        The function can accept either a module object or a path.
+        If a path is passed, the module is loaded from that file under its stem as name.
         """
-        # If a string is passed in, create a module object without executing the code
-        if isinstance(module, str):
-            spec = importlib.util.spec_from_file_location(module, module)
+        if isinstance(module, (str, pathlib.Path)):
+            path = pathlib.Path(module)
+            spec = importlib.util.spec_from_file_location(path.stem, path)
+            if spec is None:
+                raise ValueError(f"Cannot load a module from '{path}'")
             module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
 
         # Check if the module is a proper module
         if not isinstance(module, types.ModuleType):
@@ -100,24 +261,34 @@ class ToolCollection:
 
         for _, func in inspect.getmembers(module, inspect.isfunction):
             tool = Tool(func, include_return=include_return)
-            self.add_tool(tool)
+            self.add_tool(tool, namespace=namespace)
 
     def add_tools_from_package(
             self,
             package: str | pathlib.Path | types.ModuleType,
             include_return: bool = False,
+            qualify: bool = False,
     ):
-        """Extracts and formats function schemas for all modules in a package."""
+        """
+        Extracts and formats function schemas for all modules in a package.
+        With ``qualify``, tools are namespaced by their module name so that
+        same-named functions in different modules can coexist.
+        """
         if isinstance(package, str):
             package = importlib.import_module(package)
         for _, module_name, _ in pkgutil.walk_packages(package.__path__):
             module_path = f"{package.__name__}.{module_name}"
-            self.add_tools_from_module(module_path, include_return=include_return)
+            self.add_tools_from_module(
+                module_path,
+                include_return=include_return,
+                namespace=module_path if qualify else None,
+            )
 
-    def add_tools_from_glob(self, pattern: str):
+    def add_tools_from_glob(self, pattern: str, qualify: bool = False):
         """
         Given a glob pattern, find all the Python modules that match the pattern,
-        and collect the schemas from all those modules.
+        and collect the schemas from all those modules. With ``qualify``, tools
+        are namespaced by their module's file name stem.
         """
         for filename in glob.glob(pattern):
             path = pathlib.Path(filename)
@@ -125,18 +296,252 @@ class ToolCollection:
             if not path.suffix == ".py":
                 continue
             # Normalize the filename to an absolute path
-            self.add_tools_from_module(path.absolute())
+            self.add_tools_from_module(
+                path.absolute(),
+                namespace=path.stem if qualify else None,
+            )
 
-    def use_tool(self, tool_name: str, json_args: str | typing.Mapping) -> typing.Any:
+    def limit_tool(
+            self,
+            tool_name: str,
+            max_concurrency: int,
+            max_queue: int = 0,
+            queue_timeout: float = None,
+    ):
+        """
+        Bound concurrent calls to a tool. Calls beyond ``max_concurrency`` wait
+        in a queue of at most ``max_queue`` entries for ``queue_timeout`` seconds
+        and are otherwise rejected with ``admission.ToolOverloadedError``.
+
+        Limits belong to the collection, not the Tool. Views created from this
+        collection share its limits, while limits set on a view only apply to
+        calls made through that view, so each tenant overlay can have its own.
+        """
+        self._get_tool(tool_name)
+        self._limiters[tool_name] = admission.AdmissionLimiter(
+            max_concurrency, max_queue, queue_timeout)
+
+    def _limiter(self, tool_name: str, tool: Tool) -> typing.Optional[admission.AdmissionLimiter]:
+        # A limit set on the collection takes precedence over the Tool's own
+        return self._limiters.get(tool_name, tool._limiter)
+
+    def admission_stats(self) -> typing.Dict[str, typing.Dict[str, int]]:
+        """Live queue depth and admission counters for every limited tool."""
+        limiters = {name: self._limiter(name, tool) for name, tool in self._tools.items()}
+        return {name: limiter.stats() for name, limiter in limiters.items()
+                if limiter is not None}
+
+    def enable_profiling(
+            self,
+            rate: float = 1.0,
+            tool_names: typing.Iterable[str] = None,
+    ) -> profiling.Profiler:
+        """
+        Profile a fraction ``rate`` of tool calls, or only of calls to
+        ``tool_names`` if given. Returns the profiler, whose rates can be
+        adjusted later with ``set_profiling_rate``.
+        """
+        if tool_names is None:
+            self._profiler = profiling.Profiler(rate)
+        else:
+            self._profiler = profiling.Profiler()
+            for tool_name in tool_names:
+                self._profiler.set_rate(rate, tool_name)
+        return self._profiler
+
+    def disable_profiling(self):
+        self._profiler = None
+
+    def set_profiling_rate(self, rate: float, tool_name: str = None):
+        """Change the sampling rate for one tool, or the default for all tools."""
+        if self._profiler is None:
+            self.enable_profiling(0.0)
+        self._profiler.set_rate(rate, tool_name)
+
+    def profiling_report(self, limit: int = 20) -> typing.Dict[str, typing.Dict]:
+        """Per-tool time, allocation and top-function summaries of sampled calls."""
+        return self._profiler.dump(limit) if self._profiler else {}
+
+    def _profile(self, tool_name: str, tool: Tool):
+        if self._profiler is None:
+            return contextlib.nullcontext()
+        return self._profiler.profile(tool_name, tool._func)
+
+    def _call_profiled(self, tool_name: str, tool: Tool, args: typing.Mapping):
+        with self._profile(tool_name, tool):
+            return tool(**args)
+
+    async def _call_profiled_async(self, tool_name: str, tool: Tool, args: typing.Mapping):
+        with self._profile(tool_name, tool):
+            return await tool(**args)
+
+    async def _call_cancellable(
+            self,
+            tool_name: str,
+            tool: Tool,
+            args: typing.Mapping,
+            call_context: typing.Optional[context.CallContext],
+    ) -> typing.Any:
+        """Run an async tool as a task that the call context can cancel."""
+        task = asyncio.ensure_future(self._call_profiled_async(tool_name, tool, args))
+        if call_context is None:
+            return await task
+        loop = asyncio.get_running_loop()
+        stopped = []
+
+        def stop(reason: Exception):
+            if not task.done():
+                stopped.append(reason)
+                task.cancel()
+
+        unregister = call_context.add_callback(lambda: loop.call_soon_threadsafe(
+            stop, context.ToolCancelledError("Tool call was cancelled")))
+        remaining = call_context.remaining()
+        timer = None
+        if remaining is not None:
+            timer = loop.call_later(remaining, stop, context.DeadlineExceededError(
+                "Tool call deadline exceeded"))
+        try:
+            return await task
+        except asyncio.CancelledError:
+            # Only translate cancellations that came from the call context
+            if stopped and task.cancelled():
+                raise stopped[0]
+            raise
+        finally:
+            unregister()
+            if timer is not None:
+                timer.cancel()
+
+    async def _call_in_thread(
+            self,
+            tool_name: str,
+            tool: Tool,
+            args: typing.Mapping,
+            call_context: typing.Optional[context.CallContext],
+    ) -> typing.Any:
+        """
+        Run a synchronous tool in a worker thread. The thread releases the
+        admission slot when the tool returns, so cancelling the awaiting task
+        cannot let more threads run than the limiter allows.
+        """
+        limiter = self._limiter(tool_name, tool)
+        if limiter is not None:
+            await limiter.acquire_async(call_context=call_context)
+
+        def run():
+            try:
+                return self._call_profiled(tool_name, tool, args)
+            finally:
+                if limiter is not None:
+                    limiter.release()
+
+        try:
+            if call_context is not None:
+                call_context.check()
+        except BaseException:
+            if limiter is not None:
+                limiter.release()
+            raise
+        # The thread is submitted before the first suspension point, so once
+        # we get here the slot is always released by ``run``
+        return await asyncio.to_thread(run)
+
+    def _get_tool(self, tool_name: str) -> Tool:
         tool = self._tools.get(tool_name)
         if not tool:
             raise ValueError(f"No tool found with name: {tool_name}")
+        return tool
 
+    def _prepare_call(
+            self,
+            tool_name: str,
+            json_args: str | typing.Mapping,
+            buffers: binary.BufferMapping,
+            call_context: typing.Optional[context.CallContext],
+    ) -> typing.Tuple[Tool, typing.Mapping[str, typing.Any]]:
+        if call_context is not None:
+            # Refuse work nobody is waiting for any more
+            call_context.check()
+        tool = self._get_tool(tool_name)
         params_schema = tool.schema()["parameters"]
         is_string = isinstance(json_args, str)
         args = validator.parse_json(json_args) if is_string else json_args
         validator.validate_args_with_schema(args, params_schema)
-        return tool(**args)
+        args = tool.decode_args(args, buffers)
+        return tool, tool.bind_context(args, call_context)
+
+    def use_tool(
+            self,
+            tool_name: str,
+            json_args: str | typing.Mapping,
+            buffers: binary.BufferMapping = None,
+            call_context: context.CallContext = None,
+    ) -> typing.Any:
+        """
+        Validate the arguments against the tool's schema and call the tool.
+        Binary parameters are decoded after validation; ``buffers`` supplies
+        the raw data for any ``{"buffer": name}`` references in the arguments.
+        A ``call_context`` whose deadline has passed, or that was cancelled,
+        is refused before the tool runs, including while queued for admission.
+        """
+        tool, args = self._prepare_call(tool_name, json_args, buffers, call_context)
+        limiter = self._limiter(tool_name, tool)
+        admit = limiter.admit(call_context=call_context) if limiter else contextlib.nullcontext()
+        with admit:
+            if call_context is not None:
+                call_context.check()
+            return self._call_profiled(tool_name, tool, args)
+
+    async def use_tool_async(
+            self,
+            tool_name: str,
+            json_args: str | typing.Mapping,
+            buffers: binary.BufferMapping = None,
+            call_context: context.CallContext = None,
+    ) -> typing.Any:
+        """
+        Like ``use_tool``, but awaits coroutine functions and runs synchronous
+        tools in a worker thread so the event loop is never blocked. Async
+        tools are cancelled when ``call_context`` is cancelled or expires.
+        If the awaiting task is cancelled, ``call_context`` is cancelled too so
+        synchronous tools can stop cooperatively.
+        """
+        tool, args = self._prepare_call(tool_name, json_args, buffers, call_context)
+        try:
+            if not tool.is_async():
+                return await self._call_in_thread(tool_name, tool, args, call_context)
+            limiter = self._limiter(tool_name, tool)
+            admit = (limiter.admit_async(call_context=call_context) if limiter
+                     else contextlib.nullcontext())
+            async with admit:
+                if call_context is not None:
+                    call_context.check()
+                return await self._call_cancellable(tool_name, tool, args, call_context)
+        except asyncio.CancelledError:
+            if call_context is not None:
+                call_context.cancel()
+            raise
+
+    def set_result_limits(self, result_limits: typing.Optional[results.ResultLimits]):
+        self._result_limits = result_limits
+
+    def format_result(self, result: typing.Any) -> str:
+        """Serialize a tool result as message content within the result limits."""
+        return results.serialize_result(result, self._result_limits)
+
+    def use_tool_content(self, tool_name: str, json_args: str | typing.Mapping, **kwargs) -> str:
+        """Call ``use_tool`` and return the result formatted as message content."""
+        return self.format_result(self.use_tool(tool_name, json_args, **kwargs))
+
+    async def use_tool_content_async(
+            self,
+            tool_name: str,
+            json_args: str | typing.Mapping,
+            **kwargs,
+    ) -> str:
+        """Call ``use_tool_async`` and return the result formatted as message content."""
+        return self.format_result(await self.use_tool_async(tool_name, json_args, **kwargs))
 
     def schema(self) -> typing.List[schema.JsonSchema]:
-        return [tool.schema() for tool in self._tools.values()]
+        return [dict(tool.schema(), name=name) for name, tool in self._tools.items()]
@@ -1,4 +1,6 @@
+import itertools
 import json
+import pathlib
 import typing
 
 import jsonschema
@@ -19,3 +21,198 @@ def validate_args_with_schema(args: typing.Iterable, func_schema: schema.JsonSch
         return True
     except jsonschema.ValidationError as e:
         raise ValueError(f"Failed to validate JSON: {e}")
+
+
+_MISSING = object()
+
+# Keywords the compiled checks below understand. Schemas using anything else
+# are handed to jsonschema unchanged.
+_COMPILABLE_KEYWORDS = {
+    "type", "properties", "required", "additionalProperties", "items",
+    "description", "default", "title", "contentEncoding",
+}
+
+_TYPE_CHECKS = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool))
+                         or (isinstance(v, float) and v.is_integer()),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "array": lambda v: isinstance(v, list),
+    "object": lambda v: isinstance(v, dict),
+}
+
+
+def compile_schema(func_schema: schema.JsonSchema) -> typing.Optional[typing.Callable]:
+    """
+    Compile a schema into a plain predicate with the same verdict as jsonschema.
+    Returns None if the schema uses keywords the predicate cannot express.
+    """
+    if not isinstance(func_schema, dict) or not func_schema.keys() <= _COMPILABLE_KEYWORDS:
+        return None
+    checks = []
+
+    schema_type = func_schema.get("type")
+    if schema_type is not None:
+        type_names = [schema_type] if isinstance(schema_type, str) else schema_type
+        if not all(name in _TYPE_CHECKS for name in type_names):
+            return None
+        type_checks = [_TYPE_CHECKS[name] for name in type_names]
+        checks.append(lambda v: any(check(v) for check in type_checks))
+
+    property_checks = {}
+    for name, subschema in func_schema.get("properties", {}).items():
+        check = compile_schema(subschema)
+        if check is None:
+            return None
+        property_checks[name] = check
+    required = frozenset(func_schema.get("required", ()))
+    additional = func_schema.get("additionalProperties", True)
+    if additional is False:
+        allowed = frozenset(property_checks)
+        additional_check = lambda key, value: key in allowed
+    elif additional is True or additional == {}:
+        additional_check = None
+    else:
+        value_check = compile_schema(additional)
+        if value_check is None:
+            return None
+        additional_check = lambda key, value: key in property_checks or value_check(value)
+
+    if property_checks or required or additional_check:
+        def check_object(v):
+            if not isinstance(v, dict):
+                return True
+            if not required <= v.keys():
+                return False
+            for name, check in property_checks.items():
+                value = v.get(name, _MISSING)
+                if value is not _MISSING and not check(value):
+                    return False
+            if additional_check is not None:
+                return all(additional_check(key, value) for key, value in v.items())
+            return True
+        checks.append(check_object)
+
+    items = func_schema.get("items")
+    if items is not None and items != {}:
+        item_check = compile_schema(items)
+        if item_check is None:
+            return None
+        checks.append(lambda v: not isinstance(v, list) or all(map(item_check, v)))
+
+    return lambda v: all(check(v) for check in checks)
+
+
+class BatchResult:
+    """Per-record outcome of a batch validation."""
+
+    def __init__(self):
+        # One byte per record: 1 if the record passed, 0 if it failed
+        self.passed = bytearray()
+        self.errors: typing.Dict[int, str] = {}
+
+    def __len__(self):
+        return len(self.passed)
+
+    def passed_count(self) -> int:
+        return len(self.passed) - len(self.errors)
+
+    def failed_count(self) -> int:
+        return len(self.errors)
+
+
+def _iter_jsonl(path: str | pathlib.Path) -> typing.Iterator[typing.Tuple[typing.Any, str]]:
+    """Yield ``(record, parse_error)`` for each non-blank line of a JSONL file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line), None
+            except json.JSONDecodeError as e:
+                yield _MISSING, f"Failed to parse JSON: {e}"
+
+
+def validate_batch(
+        records: typing.Iterable[typing.Mapping] | str | pathlib.Path,
+        func_schema: schema.JsonSchema,
+        chunk_size: int = 1024,
+) -> BatchResult:
+    """
+    Validate many argument sets against the same schema.
+
+    ``records`` is an iterable of argument dicts or the path to a JSONL file,
+    which is streamed so memory use does not grow with its size. Records are
+    checked a chunk at a time, one property column at a time, using a
+    predicate compiled from the schema; only failing records go through
+    jsonschema to produce an error message.
+    """
+    if isinstance(records, (str, pathlib.Path)):
+        parsed = _iter_jsonl(records)
+    else:
+        parsed = ((record, None) for record in records)
+
+    validator_cls = jsonschema.validators.validator_for(func_schema)
+    validator_cls.check_schema(func_schema)
+    json_validator = validator_cls(func_schema)
+
+    compiled = _compile_columns(func_schema)
+    result = BatchResult()
+    while True:
+        chunk = list(itertools.islice(parsed, chunk_size))
+        if not chunk:
+            return result
+        offset = len(result.passed)
+        values = [record for record, _ in chunk]
+        if compiled is None:
+            passed = [False] * len(values)
+        else:
+            passed = compiled(values)
+        for i, (record, parse_error) in enumerate(chunk):
+            if parse_error is not None:
+                result.errors[offset + i] = parse_error
+                passed[i] = False
+            elif not passed[i]:
+                error = jsonschema.exceptions.best_match(json_validator.iter_errors(record))
+                if error is None:
+                    passed[i] = True
+                else:
+                    result.errors[offset + i] = f"Failed to validate JSON: {error.message}"
+        result.passed.extend(passed)
+
+
+def _compile_columns(
+        func_schema: schema.JsonSchema,
+) -> typing.Optional[typing.Callable[[typing.List[typing.Any]], typing.List[bool]]]:
+    """
+    Compile an object schema into a check over a whole chunk of records,
+    applying the required-key check and each property's predicate column-wise.
+    """
+    if func_schema.get("type") != "object" or func_schema.get("additionalProperties", True) is not True:
+        return None
+    property_checks = {}
+    for name, subschema in func_schema.get("properties", {}).items():
+        check = compile_schema(subschema)
+        if check is None:
+            return None
+        property_checks[name] = check
+    rest = {k: v for k, v in func_schema.items()
+            if k not in ("type", "properties", "required")}
+    if not rest.keys() <= _COMPILABLE_KEYWORDS - {"items"}:
+        return None
+    required = frozenset(func_schema.get("required", ()))
+
+    def check_chunk(records):
+        passed = [isinstance(record, dict) and required <= record.keys()
+                  for record in records]
+        for name, check in property_checks.items():
+            column = [record.get(name, _MISSING) if ok else _MISSING
+                      for record, ok in zip(records, passed)]
+            for i, value in enumerate(column):
+                if value is not _MISSING and not check(value):
+                    passed[i] = False
+        return passed
+
+    return check_chunk
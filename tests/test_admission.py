@@ -0,0 +1,206 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from llmfuncs.admission import AdmissionLimiter, ToolOverloadedError
+from llmfuncs.context import CallContext, DeadlineExceededError, ToolCancelledError
+from llmfuncs.tool import Tool, ToolCollection
+
+release_event = threading.Event()
+
+
+def slow_lookup(key: str) -> str:
+    """Look up a key in a slow backend.
+
+    Args:
+        key (str): The key to look up.
+    """
+    release_event.wait(5)
+    return key.upper()
+
+
+running_lock = threading.Lock()
+running = {"now": 0, "peak": 0}
+
+
+def counted_lookup(key: str) -> str:
+    """Look up a key, recording how many lookups run at once.
+
+    Args:
+        key (str): The key to look up.
+    """
+    with running_lock:
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+    release_event.wait(0.2)
+    with running_lock:
+        running["now"] -= 1
+    return key.upper()
+
+
+async def async_lookup(key: str) -> str:
+    """Look up a key in an async backend.
+
+    Args:
+        key (str): The key to look up.
+    """
+    await asyncio.sleep(0.05)
+    return key.upper()
+
+
+class TestAdmissionLimiter(unittest.TestCase):
+
+    def test_rejects_when_queue_full(self):
+        limiter = AdmissionLimiter(max_concurrency=1)
+        limiter.acquire()
+        with self.assertRaises(ToolOverloadedError):
+            limiter.acquire()
+        limiter.release()
+        self.assertEqual(limiter.stats()["rejected"], 1)
+        self.assertEqual(limiter.stats()["active"], 0)
+
+    def test_queue_timeout(self):
+        limiter = AdmissionLimiter(max_concurrency=1, max_queue=1, queue_timeout=0.01)
+        limiter.acquire()
+        with self.assertRaises(ToolOverloadedError):
+            limiter.acquire()
+        stats = limiter.stats()
+        self.assertEqual(stats["timed_out"], 1)
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_release_hands_slot_to_waiter(self):
+        limiter = AdmissionLimiter(max_concurrency=1, max_queue=1)
+        limiter.acquire()
+        acquired = threading.Event()
+
+        def waiter():
+            limiter.acquire(timeout=5)
+            acquired.set()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        while limiter.stats()["queue_depth"] == 0:
+            pass
+        limiter.release()
+        thread.join()
+        self.assertTrue(acquired.is_set())
+        self.assertEqual(limiter.stats()["active"], 1)
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            AdmissionLimiter(max_concurrency=0)
+
+
+class TestToolCollectionAdmission(unittest.TestCase):
+
+    def setUp(self):
+        release_event.clear()
+        self.collection = ToolCollection(
+            [Tool(slow_lookup), Tool(async_lookup), Tool(counted_lookup)])
+
+    def test_threaded_calls_are_shed(self):
+        self.collection.limit_tool("slow_lookup", max_concurrency=1)
+        thread = threading.Thread(
+            target=self.collection.use_tool, args=("slow_lookup", {"key": "a"}))
+        thread.start()
+        while self.collection.admission_stats()["slow_lookup"]["active"] == 0:
+            pass
+        with self.assertRaises(ToolOverloadedError):
+            self.collection.use_tool("slow_lookup", {"key": "b"})
+        release_event.set()
+        thread.join()
+        stats = self.collection.admission_stats()["slow_lookup"]
+        self.assertEqual(stats["admitted"], 1)
+        self.assertEqual(stats["rejected"], 1)
+
+    def _occupy_slow_lookup(self) -> threading.Thread:
+        self.collection.limit_tool("slow_lookup", max_concurrency=1, max_queue=1)
+        thread = threading.Thread(
+            target=self.collection.use_tool, args=("slow_lookup", {"key": "a"}))
+        thread.start()
+        while self.collection.admission_stats()["slow_lookup"]["active"] == 0:
+            pass
+        return thread
+
+    def test_deadline_passes_while_queued(self):
+        thread = self._occupy_slow_lookup()
+        with self.assertRaises(DeadlineExceededError):
+            self.collection.use_tool(
+                "slow_lookup", {"key": "b"}, call_context=CallContext(timeout=0.1))
+        release_event.set()
+        thread.join()
+        stats = self.collection.admission_stats()["slow_lookup"]
+        self.assertEqual(stats["timed_out"], 0)
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_cancelled_while_queued(self):
+        thread = self._occupy_slow_lookup()
+        ctx = CallContext()
+        threading.Timer(0.05, ctx.cancel).start()
+        start = time.monotonic()
+        with self.assertRaises(ToolCancelledError):
+            self.collection.use_tool("slow_lookup", {"key": "b"}, call_context=ctx)
+        self.assertLess(time.monotonic() - start, 1)
+        release_event.set()
+        thread.join()
+        self.assertEqual(self.collection.admission_stats()["slow_lookup"]["timed_out"], 0)
+
+    def test_cancelled_while_queued_async(self):
+        self.collection.limit_tool("async_lookup", max_concurrency=1, max_queue=1)
+
+        async def run():
+            ctx = CallContext()
+            first = asyncio.ensure_future(
+                self.collection.use_tool_async("async_lookup", {"key": "a"}))
+            await asyncio.sleep(0)
+            asyncio.get_running_loop().call_later(0.01, ctx.cancel)
+            with self.assertRaises(ToolCancelledError):
+                await self.collection.use_tool_async(
+                    "async_lookup", {"key": "b"}, call_context=ctx)
+            return await first
+
+        self.assertEqual(asyncio.run(run()), "A")
+        self.assertEqual(self.collection.admission_stats()["async_lookup"]["timed_out"], 0)
+
+    def test_unlimited_tools_have_no_stats(self):
+        self.assertEqual(self.collection.admission_stats(), {})
+
+    def test_async_calls_queue(self):
+        self.collection.limit_tool("async_lookup", max_concurrency=1, max_queue=1)
+
+        async def run():
+            calls = [self.collection.use_tool_async("async_lookup", {"key": k})
+                     for k in "abc"]
+            return await asyncio.gather(*calls, return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertEqual(results[:2], ["A", "B"])
+        self.assertIsInstance(results[2], ToolOverloadedError)
+
+    def test_async_dispatch_of_sync_tool(self):
+        release_event.set()
+        result = asyncio.run(self.collection.use_tool_async("slow_lookup", {"key": "x"}))
+        self.assertEqual(result, "X")
+
+    def test_cancelled_caller_keeps_slot_until_thread_finishes(self):
+        running.update(now=0, peak=0)
+        self.collection.limit_tool("counted_lookup", max_concurrency=1, max_queue=5)
+
+        async def run():
+            calls = [asyncio.wait_for(
+                self.collection.use_tool_async("counted_lookup", {"key": k}), 0.05)
+                for k in "abcde"]
+            return await asyncio.gather(*calls, return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(r, asyncio.TimeoutError) for r in results))
+        stats = self.collection.admission_stats()["counted_lookup"]
+        while stats["active"]:
+            stats = self.collection.admission_stats()["counted_lookup"]
+        self.assertEqual(running["peak"], 1)
+        self.assertEqual(stats["admitted"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
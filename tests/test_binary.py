@@ -0,0 +1,166 @@
+import json
+import typing
+import unittest
+
+from llmfuncs import binary
+from llmfuncs.tool import Tool, ToolCollection
+
+try:
+    import numpy
+    import numpy.typing
+except ImportError:
+    numpy = None
+
+
+def checksum(data: bytes) -> int:
+    """Sum the bytes of a blob.
+
+    Args:
+        data (bytes): The binary blob.
+
+    Returns:
+        int: The sum of all bytes.
+    """
+    return sum(data)
+
+
+def total_length(blobs: typing.List[bytes], named: typing.Dict[str, bytes] = None) -> int:
+    """Total length of several blobs.
+
+    Args:
+        blobs (List[bytes]): The binary blobs.
+        named (Dict[str, bytes], optional): More blobs, by name.
+    """
+    return sum(map(len, blobs)) + sum(map(len, (named or {}).values()))
+
+
+class TestBytesParameters(unittest.TestCase):
+
+    def setUp(self):
+        self.collection = ToolCollection()
+        self.collection.add_tool(Tool(checksum))
+
+    def test_schema_for_bytes(self):
+        param = Tool(checksum).schema()["parameters"]["properties"]["data"]
+        self.assertEqual(param["anyOf"][0],
+                         {"type": "string", "contentEncoding": "base64"})
+        self.assertEqual(param["description"], "The binary blob.")
+        self.assertNotIn("description", binary.BYTES_SCHEMA)
+
+    def test_use_tool_with_base64(self):
+        args = {"data": binary.encode_bytes(b"\x01\x02\x03")}
+        self.assertEqual(self.collection.use_tool("checksum", args), 6)
+
+    def test_use_tool_with_sidecar_buffer(self):
+        args = '{"data": {"buffer": "blob"}}'
+        result = self.collection.use_tool("checksum", args,
+                                          buffers={"blob": b"\x05\x05"})
+        self.assertEqual(result, 10)
+
+    def test_use_tool_with_missing_buffer(self):
+        with self.assertRaises(ValueError):
+            self.collection.use_tool("checksum", {"data": {"buffer": "blob"}})
+
+    def test_use_tool_with_invalid_base64(self):
+        with self.assertRaises(ValueError):
+            self.collection.use_tool("checksum", {"data": "not base64!"})
+
+    def test_nested_bytes_are_decoded(self):
+        self.collection.add_tool(Tool(total_length))
+        args = {
+            "blobs": [binary.encode_bytes(b"abc"), {"buffer": "raw"}],
+            "named": {"x": binary.encode_bytes(b"de")},
+        }
+        result = self.collection.use_tool("total_length", args, buffers={"raw": b"\x00"})
+        self.assertEqual(result, 6)
+
+    def test_bytes_default_is_encoded(self):
+        def pad(data: bytes = b"\x00\x01") -> int:
+            """Pad a blob.
+
+            Args:
+                data (bytes, optional): The binary blob.
+            """
+            return len(data)
+
+        collection = ToolCollection([Tool(pad)])
+        param = collection.schema()[0]["parameters"]["properties"]["data"]
+        self.assertEqual(param["default"], "AAE=")
+        json.dumps(collection.schema())
+        self.assertEqual(collection.use_tool("pad", {}), 2)
+
+    def test_decode_bytes_is_memoryview(self):
+        self.assertIsInstance(binary.decode_bytes("AAE="), memoryview)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestArrayParameters(unittest.TestCase):
+
+    def setUp(self):
+        def norm(vector: numpy.typing.NDArray[numpy.float32]) -> float:
+            """Compute the squared norm of a vector.
+
+            Args:
+                vector (NDArray[float32]): The vector.
+            """
+            return float((vector * vector).sum())
+
+        self.collection = ToolCollection()
+        self.collection.add_tool(Tool(norm))
+
+    def test_schema_pins_dtype(self):
+        param = self.collection.schema()[0]["parameters"]["properties"]["vector"]
+        self.assertEqual(param["type"], "object")
+        self.assertIn("float32", param["properties"]["dtype"]["enum"])
+
+    def test_unpinned_dtypes(self):
+        def bare(vector: numpy.typing.NDArray) -> int:
+            """Count items.
+
+            Args:
+                vector (NDArray): The vector.
+            """
+            return vector.size
+
+        def floating(vector: numpy.typing.NDArray[numpy.floating]) -> int:
+            """Count items.
+
+            Args:
+                vector (NDArray[floating]): The vector.
+            """
+            return vector.size
+
+        for func in (bare, floating):
+            tool = Tool(func)
+            dtype = tool.schema()["parameters"]["properties"]["vector"]["properties"]["dtype"]
+            self.assertEqual(dtype, {"type": "string"})
+            args = {"vector": binary.encode_array(numpy.arange(3, dtype="<i2"))}
+            self.assertEqual(ToolCollection([tool]).use_tool(func.__name__, args), 3)
+
+    def test_use_tool_with_array(self):
+        vector = numpy.arange(4, dtype=numpy.float32)
+        args = {"vector": binary.encode_array(vector)}
+        self.assertEqual(self.collection.use_tool("norm", args), 14.0)
+
+    def test_use_tool_with_wrong_dtype(self):
+        vector = numpy.arange(4, dtype=numpy.float64)
+        with self.assertRaises(ValueError):
+            self.collection.use_tool("norm", {"vector": binary.encode_array(vector)})
+
+    def test_use_tool_with_wrong_shape(self):
+        args = {"vector": binary.encode_array(numpy.arange(4, dtype=numpy.float32))}
+        args["vector"]["shape"] = [5]
+        with self.assertRaises(ValueError):
+            self.collection.use_tool("norm", args)
+
+    def test_decode_array_shares_buffer(self):
+        data = bytearray(numpy.arange(6, dtype="<i4").tobytes())
+        args = {"dtype": "<i4", "shape": [2, 3], "data": {"buffer": "raw"}}
+        array = binary.decode_array(args, {"raw": data})
+        data[0] = 7
+        self.assertEqual(array[0, 0], 7)
+        self.assertEqual(array.shape, (2, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
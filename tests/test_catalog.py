@@ -0,0 +1,131 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+import example
+import test_binary
+import test_context
+import test_tool
+from llmfuncs import binary, catalog
+from llmfuncs.context import CallContext
+from llmfuncs.tool import Tool, ToolCollection
+
+
+class TestCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.collection = ToolCollection()
+        self.collection.add_tools_from_module(example)
+        self.collection.add_tool(Tool(test_tool.test_function2, include_return=True))
+        self.collection.add_tool(Tool(test_binary.checksum))
+        self.collection.add_tool(Tool(test_binary.total_length))
+        self.collection.add_tool(Tool(test_context.sleep), namespace="ctx")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "tools.cat")
+        catalog.build_catalog(self.collection, self.path, version="1")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_schema_round_trip(self):
+        loaded = catalog.load_catalog(self.path)
+        self.assertEqual(loaded.schema(), self.collection.schema())
+        self.assertEqual(catalog.Catalog(self.path).schema(), self.collection.schema())
+
+    def test_version(self):
+        self.assertEqual(catalog.Catalog(self.path).version, "1")
+
+    def test_dispatch(self):
+        loaded = catalog.load_catalog(self.path)
+        self.assertEqual(loaded.use_tool("test_function2", {"a": 2.0}), [2])
+        args = {"data": binary.encode_bytes(b"\x01\x02")}
+        self.assertEqual(loaded.use_tool("checksum", args), 3)
+        args = {"blobs": [binary.encode_bytes(b"abc")], "named": {"x": {"buffer": "x"}}}
+        self.assertEqual(loaded.use_tool("total_length", args, buffers={"x": b"\x00"}), 4)
+        with self.assertRaises(ValueError):
+            loaded.use_tool("test_function2", {"a": "x"})
+
+    def test_async_dispatch_with_context(self):
+        loaded = catalog.load_catalog(self.path)
+        result = asyncio.run(loaded.use_tool_async(
+            "ctx__sleep", {"seconds": 0}, call_context=CallContext(timeout=5)))
+        self.assertEqual(result, "done")
+
+    def test_functions_resolved_lazily(self):
+        loaded = catalog.load_catalog(self.path)
+        tool = loaded._tools["checksum"]
+        self.assertIsNone(tool._resolved)
+        self.assertEqual(tool.name(), "checksum")
+        loaded.use_tool("checksum", {"data": ""})
+        self.assertIs(tool._resolved, test_binary.checksum)
+
+    def test_schemas_parsed_once(self):
+        loaded = catalog.load_catalog(self.path)
+        tool = loaded._tools["checksum"]
+        self.assertIsNone(tool._schema)
+        loaded.use_tool("checksum", {"data": ""})
+        parsed = tool._schema
+        self.assertIsNotNone(parsed)
+        loaded.use_tool("checksum", {"data": ""})
+        self.assertIs(tool._schema, parsed)
+
+        loaded = catalog.load_catalog(self.path)
+        first = loaded.schema()
+        self.assertIsNotNone(loaded._tools["checksum"]._schema)
+        first[0]["name"] = "changed"
+        self.assertEqual(loaded.schema(), self.collection.schema())
+
+    def test_added_tools_included_in_schema(self):
+        loaded = catalog.load_catalog(self.path)
+        loaded.add_tool(Tool(test_tool.test_function1))
+        self.assertEqual(loaded.schema()[-1]["name"], "test_function1")
+        self.assertEqual(len(loaded.schema()), len(self.collection) + 1)
+
+    def test_file_mode_follows_umask(self):
+        umask = os.umask(0o022)
+        try:
+            catalog.build_catalog(self.collection, self.path)
+        finally:
+            os.umask(umask)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+
+    def test_local_functions_rejected(self):
+        def local(x: int) -> int:
+            """
+            Local function.
+
+            Args:
+                x (int): Test variable
+            """
+            return x
+
+        with self.assertRaises(ValueError):
+            catalog.build_catalog(ToolCollection([Tool(local)]), self.path)
+
+    def test_unimportable_functions_rejected(self):
+        def greet(name: str) -> str:
+            """
+            Greet someone.
+
+            Args:
+                name (str): The name.
+            """
+            return name
+
+        # Not importable, missing, and a different function under the same path
+        for module, qualname in [("__main__", "greet"), (__name__, "greet"),
+                                 ("test_binary", "checksum")]:
+            greet.__module__, greet.__qualname__ = module, qualname
+            with self.assertRaises(ValueError):
+                catalog.build_catalog(ToolCollection([Tool(greet)]), self.path)
+
+    def test_not_a_catalog(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a catalog")
+        with self.assertRaises(ValueError):
+            catalog.Catalog(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import unittest
+
+from llmfuncs.context import CallContext, DeadlineExceededError, ToolCancelledError
+from llmfuncs.tool import Tool, ToolCollection
+
+calls = []
+
+
+def poll(attempts: int, ctx: CallContext) -> int:
+    """Poll a backend until cancelled.
+
+    Args:
+        attempts (int): Maximum number of polls.
+    """
+    calls.append(ctx)
+    for attempt in range(attempts):
+        if ctx.wait(0.01):
+            return attempt
+    return attempts
+
+
+async def sleep(seconds: float, ctx: CallContext = None) -> str:
+    """Sleep for a while.
+
+    Args:
+        seconds (float): How long to sleep.
+    """
+    await asyncio.sleep(seconds)
+    return "done"
+
+
+class TestCallContext(unittest.TestCase):
+
+    def test_remaining_and_expired(self):
+        self.assertIsNone(CallContext().remaining())
+        self.assertFalse(CallContext(timeout=60).expired())
+        self.assertTrue(CallContext(timeout=0).expired())
+
+    def test_check(self):
+        ctx = CallContext()
+        ctx.check()
+        ctx.cancel()
+        with self.assertRaises(ToolCancelledError):
+            ctx.check()
+        with self.assertRaises(DeadlineExceededError):
+            CallContext(timeout=0).check()
+
+    def test_callbacks(self):
+        ctx = CallContext()
+        fired = []
+        unregister = ctx.add_callback(lambda: fired.append(1))
+        ctx.add_callback(lambda: fired.append(2))
+        unregister()
+        ctx.cancel()
+        ctx.add_callback(lambda: fired.append(3))
+        self.assertEqual(fired, [2, 3])
+
+
+class TestDispatchWithContext(unittest.TestCase):
+
+    def setUp(self):
+        calls.clear()
+        self.collection = ToolCollection([Tool(poll), Tool(sleep)])
+
+    def test_context_param_excluded_from_schema(self):
+        schemas = {s["name"]: s["parameters"] for s in self.collection.schema()}
+        self.assertEqual(list(schemas["poll"]["properties"]), ["attempts"])
+        self.assertEqual(schemas["poll"]["required"], ["attempts"])
+        self.assertEqual(list(schemas["sleep"]["properties"]), ["seconds"])
+
+    def test_context_injected(self):
+        ctx = CallContext(timeout=60)
+        self.assertEqual(self.collection.use_tool("poll", {"attempts": 2}, call_context=ctx), 2)
+        self.assertIs(calls[0], ctx)
+        self.collection.use_tool("poll", {"attempts": 1})
+        self.assertIsInstance(calls[1], CallContext)
+
+    def test_expired_deadline_refused(self):
+        with self.assertRaises(DeadlineExceededError):
+            self.collection.use_tool("poll", {"attempts": 1}, call_context=CallContext(timeout=0))
+        self.assertEqual(calls, [])
+
+    def test_sync_tool_stops_cooperatively(self):
+        ctx = CallContext()
+        threading.Timer(0.05, ctx.cancel).start()
+        result = self.collection.use_tool("poll", {"attempts": 1000}, call_context=ctx)
+        self.assertLess(result, 1000)
+
+    def test_async_tool_deadline(self):
+        ctx = CallContext(timeout=0.05)
+        with self.assertRaises(DeadlineExceededError):
+            asyncio.run(self.collection.use_tool_async(
+                "sleep", {"seconds": 10}, call_context=ctx))
+
+    def test_async_tool_cancelled(self):
+        async def run():
+            ctx = CallContext()
+            asyncio.get_running_loop().call_later(0.05, ctx.cancel)
+            await self.collection.use_tool_async("sleep", {"seconds": 10}, call_context=ctx)
+
+        with self.assertRaises(ToolCancelledError):
+            asyncio.run(run())
+
+    def test_async_tool_finishes_in_time(self):
+        result = asyncio.run(self.collection.use_tool_async(
+            "sleep", {"seconds": 0}, call_context=CallContext(timeout=10)))
+        self.assertEqual(result, "done")
+
+    def test_caller_cancellation_reaches_sync_tool(self):
+        async def run():
+            ctx = CallContext()
+            task = asyncio.ensure_future(self.collection.use_tool_async(
+                "poll", {"attempts": 1000}, call_context=ctx))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return ctx
+
+        self.assertTrue(asyncio.run(run()).cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import inspect
+import unittest
+
+from docstring_parser import google
+
+import example
+import test_tool
+from llmfuncs.docstrings import parse_docstring
+
+
+def dump(parsed):
+    meta = [(type(m).__name__, m.args, m.description,
+             getattr(m, "arg_name", None), getattr(m, "type_name", None),
+             getattr(m, "is_optional", None), getattr(m, "default", None))
+            for m in parsed.meta]
+    return (parsed.short_description, parsed.long_description,
+            parsed.blank_after_short_description,
+            parsed.blank_after_long_description, meta)
+
+
+class TestParseDocstring(unittest.TestCase):
+
+    def test_matches_google_parser(self):
+        docs = [inspect.getdoc(func)
+                for module in (example, test_tool)
+                for _, func in inspect.getmembers(module, inspect.isfunction)
+                if inspect.getdoc(func)]
+        docs.append(
+            "Summary.\n\nLong\ntext.\n\nArgs:\n"
+            "    a: First. Defaults to 3.\n        Continued.\n\n"
+            "    b (int, optional): Second.\n"
+            "Returns:\n    int: The result\n    over two lines.")
+        for doc in docs:
+            self.assertEqual(dump(parse_docstring(doc)), dump(google.parse(doc)), doc)
+
+    def test_other_sections_fall_back(self):
+        doc = "Summary.\n\nArgs:\n    a (int): First.\n\nRaises:\n    ValueError: Bad a."
+        self.assertEqual(len(parse_docstring(doc).raises), 1)
+
+    def test_rest_style(self):
+        doc = "Summary.\n\n:param a: First.\n:returns: Result."
+        self.assertEqual(parse_docstring(doc).params[0].description, "First.")
+
+    def test_results_are_shared(self):
+        doc = inspect.getdoc(test_tool.test_function1)
+        self.assertIs(parse_docstring(doc), parse_docstring(doc))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import pstats
+import tempfile
+import threading
+import tracemalloc
+import unittest
+
+from llmfuncs.profiling import Profiler
+from llmfuncs.tool import Tool, ToolCollection
+
+leaked = []
+
+
+def allocate(size: int) -> int:
+    """Allocate and keep a list.
+
+    Args:
+        size (int): Number of items to allocate.
+    """
+    leaked.append(list(range(size)))
+    return size
+
+
+other_started = threading.Event()
+other_done = threading.Event()
+
+
+def wait_for_other() -> int:
+    """Wait while another thread allocates."""
+    other_started.set()
+    other_done.wait(5)
+    return 0
+
+
+async def allocate_async(size: int) -> int:
+    """Allocate a list asynchronously.
+
+    Args:
+        size (int): Number of items to allocate.
+    """
+    await asyncio.sleep(0)
+    return len(list(range(size)))
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        leaked.clear()
+        self.collection = ToolCollection([Tool(allocate), Tool(allocate_async)])
+
+    def test_profiling_disabled_by_default(self):
+        self.collection.use_tool("allocate", {"size": 10})
+        self.assertEqual(self.collection.profiling_report(), {})
+
+    def test_profile_records_allocations(self):
+        self.collection.enable_profiling(rate=1.0, tool_names=["allocate"])
+        self.collection.use_tool("allocate", {"size": 10000})
+        self.collection.use_tool("allocate", {"size": 10000})
+        asyncio.run(self.collection.use_tool_async("allocate_async", {"size": 10}))
+        report = self.collection.profiling_report()
+        self.assertEqual(list(report), ["allocate"])
+        self.assertEqual(report["allocate"]["samples"], 2)
+        self.assertGreater(report["allocate"]["net_allocated"], 2 * 10000 * 28)
+        self.assertIn("allocate", report["allocate"]["top_functions"])
+
+    def test_rate_adjustable_at_runtime(self):
+        self.collection.enable_profiling(rate=0.0)
+        self.collection.use_tool("allocate", {"size": 10})
+        self.collection.set_profiling_rate(1.0, "allocate_async")
+        asyncio.run(self.collection.use_tool_async("allocate_async", {"size": 10}))
+        self.collection.set_profiling_rate(1.0)
+        asyncio.run(self.collection.use_tool_async("allocate", {"size": 10}))
+        report = self.collection.profiling_report()
+        self.assertEqual(report["allocate_async"]["samples"], 1)
+        self.assertEqual(report["allocate"]["samples"], 1)
+
+    def test_dump_stats(self):
+        profiler = self.collection.enable_profiling()
+        self.collection.use_tool("allocate", {"size": 10})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "allocate.prof")
+            profiler.dump_stats("allocate", path)
+            self.assertGreater(pstats.Stats(path).total_calls, 0)
+        with self.assertRaises(ValueError):
+            profiler.dump_stats("allocate_async", path)
+
+    def test_other_threads_not_attributed(self):
+        self.collection.add_tool(Tool(wait_for_other))
+        self.collection.enable_profiling(rate=1.0)
+        other_started.clear()
+        other_done.clear()
+
+        # Compiled under another file name, as code from another module would be
+        allocate_elsewhere = compile(
+            "other_started.wait(5)\n"
+            "leaked.append(list(range(100000)))\n"
+            "other_done.set()\n",
+            "<other module>", "exec")
+        thread = threading.Thread(target=exec, args=(allocate_elsewhere, globals()))
+        thread.start()
+        self.collection.use_tool("wait_for_other", {})
+        thread.join()
+        report = self.collection.profiling_report()["wait_for_other"]
+        self.assertLess(report["net_allocated"], 100000)
+
+    def test_existing_tracing_keeps_its_peak(self):
+        self.collection.enable_profiling(rate=1.0)
+        tracemalloc.start()
+        try:
+            data = bytearray(1_000_000)
+            del data
+            self.collection.use_tool("allocate", {"size": 10000})
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertGreaterEqual(peak, 1_000_000)
+        report = self.collection.profiling_report()["allocate"]
+        self.assertGreater(report["net_allocated"], 10000 * 28)
+        self.assertEqual(report["peak_allocated"], 0)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            Profiler().set_rate(1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import unittest
+
+from llmfuncs.results import ResultLimits, serialize_result
+from llmfuncs.tool import Tool, ToolCollection
+
+
+def search(query: str) -> dict:
+    """Search documents.
+
+    Args:
+        query (str): The search query.
+    """
+    return {"query": query, "hits": [{"id": i, "title": f"Doc {i}"} for i in range(10000)]}
+
+
+class TestSerializeResult(unittest.TestCase):
+
+    def setUp(self):
+        self.result = search("llm")
+
+    def test_unlimited(self):
+        self.assertEqual(json.loads(serialize_result(self.result)), self.result)
+
+    def test_max_bytes(self):
+        text = serialize_result(self.result, ResultLimits(max_bytes=200))
+        self.assertLessEqual(len(text), 200)
+        parsed = json.loads(text)
+        self.assertEqual(parsed["query"], "llm")
+        self.assertEqual(parsed["hits"][0], {"id": 0, "title": "Doc 0"})
+        self.assertRegex(parsed["hits"][-1], r"^\.\.\. \d+ more items$")
+
+    def test_max_tokens(self):
+        text = serialize_result(self.result, ResultLimits(max_tokens=50))
+        self.assertLessEqual(len(text), 200)
+        json.loads(text)
+
+    def test_max_items_and_string(self):
+        limits = ResultLimits(max_items=2, max_string=3)
+        parsed = json.loads(serialize_result(self.result, limits))
+        self.assertEqual(parsed["hits"], [{"id": 0, "title": "Doc..."},
+                                          {"id": 1, "title": "Doc..."},
+                                          "... 9998 more items"])
+
+    def test_nested_truncation_is_valid_json(self):
+        value = [[{"a": "x" * 100}] * 10] * 10
+        for max_bytes in range(0, 400, 7):
+            text = serialize_result(value, ResultLimits(max_bytes=max_bytes))
+            self.assertLessEqual(len(text), max_bytes)
+            if max_bytes >= 2:
+                json.loads(text)
+
+    def test_small_nested_result_is_kept(self):
+        value = {"a": {"b": {"c": {"d": [1, 2, 3]}}}}
+        self.assertEqual(json.loads(serialize_result(value, ResultLimits(max_tokens=30))), value)
+        deep = {"a": {"b": {"c": {"d": {"e": {"f": {"g": 1}}}}}}}
+        self.assertEqual(json.loads(serialize_result(deep, ResultLimits(max_bytes=250))), deep)
+        text = json.dumps(value)
+        self.assertEqual(serialize_result(value, ResultLimits(max_bytes=len(text))), text)
+
+    def test_marker_replaces_items_when_out_of_room(self):
+        text = serialize_result(list(range(100)), ResultLimits(max_bytes=40))
+        self.assertLessEqual(len(text), 40)
+        parsed = json.loads(text)
+        self.assertRegex(parsed[-1], r"^\.\.\. \d+ more items$")
+        self.assertEqual(parsed[:-1], list(range(len(parsed) - 1)))
+
+    def test_string_result(self):
+        self.assertEqual(serialize_result("héllo", ResultLimits(max_bytes=10)), "héllo")
+        self.assertEqual(serialize_result("héllo wörld", ResultLimits(max_bytes=6)), "hé...")
+        self.assertEqual(serialize_result("hello", ResultLimits(max_bytes=2)), "he")
+        self.assertEqual(serialize_result("x" * 100, ResultLimits(max_string=5)), "xxxxx...")
+        self.assertEqual(serialize_result("x" * 100, ResultLimits(max_string=50, max_bytes=6)),
+                         "xxx...")
+
+    def test_non_json_values(self):
+        self.assertEqual(json.loads(serialize_result({"s": {1}}, ResultLimits(max_bytes=100))),
+                         {"s": "{1}"})
+
+
+class TestToolCollectionResults(unittest.TestCase):
+
+    def test_use_tool_content(self):
+        collection = ToolCollection([Tool(search)], result_limits=ResultLimits(max_bytes=500))
+        text = collection.use_tool_content("search", {"query": "llm"})
+        self.assertLessEqual(len(text), 500)
+        text = asyncio.run(collection.use_tool_content_async("search", {"query": "llm"}))
+        self.assertLessEqual(len(text), 500)
+        self.assertEqual(collection.subset(["search"]).format_result(["x"] * 1000)[-1], "]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import types
 import unittest
 from typing import Dict, List, Optional
@@ -98,6 +100,24 @@ class TestTool(unittest.TestCase):
             Tool(func)
 
 
+    def test_shared_type_schemas_are_not_mutated(self):
+        def func(a: List[Dict[str, int]]) -> str:
+            """
+            Test function.
+
+            Args:
+                a (List[Dict[str, int]]): Another description.
+            """
+            return ""
+
+        schema6 = Tool(test_function6).schema()["parameters"]["properties"]["a"]
+        schema_func = Tool(func).schema()["parameters"]["properties"]["a"]
+        self.assertNotEqual(schema6["description"], schema_func["description"])
+        self.assertIs(schema6["items"], schema_func["items"])
+        with self.assertRaises(TypeError):
+            schema6["items"]["description"] = "changed"
+
+
 class TestToolCollection(unittest.TestCase):
 
     def test_tool_collection_init_empty(self):
@@ -242,6 +262,96 @@ class TestToolCollectionFromModule(unittest.TestCase):
         self.assertEqual(schema2["parameters"]["properties"]["a"]["type"], "number")
 
 
+class TestToolCollectionNamespaces(unittest.TestCase):
+
+    def setUp(self):
+        def negate(x: int) -> int:
+            """
+            Same name as the module-level test function.
+
+            Args:
+                x (int): Test variable
+            """
+            return -x
+
+        negate.__name__ = "test_function1"
+        self.shadow = Tool(negate)
+        self.collection = ToolCollection([Tool(test_function1), Tool(test_function2)])
+
+    def test_add_tool_conflict(self):
+        with self.assertRaises(ValueError):
+            self.collection.add_tool(self.shadow)
+        self.collection.add_tool(Tool(test_function1))
+        self.assertEqual(len(self.collection), 2)
+
+    def test_add_tool_with_namespace(self):
+        self.collection.add_tool(self.shadow, namespace="tenant.a")
+        self.assertIn("tenant_a__test_function1", self.collection)
+        names = [s["name"] for s in self.collection.schema()]
+        self.assertEqual(names, ["test_function1", "test_function2",
+                                 "tenant_a__test_function1"])
+        self.assertEqual(self.collection.use_tool("tenant_a__test_function1", {"x": 2}), -2)
+
+    def test_add_tools_from_glob_qualified(self):
+        source = (
+            "def search(query: str) -> str:\n"
+            "    \"\"\"\n"
+            "    Search.\n\n"
+            "    Args:\n"
+            "        query (str): The query.\n"
+            "    \"\"\"\n"
+            "    return {prefix!r} + query\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            for stem in ("docs", "web"):
+                with open(os.path.join(tmp, f"{stem}.py"), "w") as f:
+                    f.write(source.format(prefix=stem))
+            pattern = os.path.join(tmp, "*.py")
+            with self.assertRaises(ValueError):
+                ToolCollection().add_tools_from_glob(pattern)
+            collection = ToolCollection()
+            collection.add_tools_from_glob(pattern, qualify=True)
+        self.assertEqual(collection.use_tool("docs__search", {"query": "x"}), "docsx")
+        self.assertEqual(collection.use_tool("web__search", {"query": "x"}), "webx")
+
+    def test_view_limits_stay_in_view(self):
+        tenant_a = self.collection.overlay()
+        tenant_b = self.collection.overlay()
+        tenant_a.limit_tool("test_function1", max_concurrency=1)
+        self.assertIn("test_function1", tenant_a.admission_stats())
+        self.assertEqual(self.collection.admission_stats(), {})
+        self.assertEqual(tenant_b.admission_stats(), {})
+
+        self.collection.limit_tool("test_function2", max_concurrency=2)
+        subset = self.collection.subset(["test_function2"])
+        subset.use_tool("test_function2", {"a": 1.0})
+        self.assertEqual(self.collection.admission_stats()["test_function2"]["admitted"], 1)
+
+    def test_subset_shares_tools(self):
+        view = self.collection.subset(["test_function2"])
+        self.assertEqual(len(view), 1)
+        self.assertIs(view._tools["test_function2"], self.collection._tools["test_function2"])
+        with self.assertRaises(ValueError):
+            self.collection.subset(["missing"])
+
+    def test_overlay(self):
+        tenant = self.collection.overlay([self.shadow])
+        self.assertEqual(tenant.use_tool("test_function1", {"x": 2}), -2)
+        self.assertEqual(self.collection.use_tool("test_function1", {"x": 2}), "hellohello")
+        tenant.add_tool(Tool(test_function3))
+        self.assertNotIn("test_function3", self.collection)
+        self.collection.add_tool(Tool(test_function4))
+        self.assertIn("test_function4", tenant)
+        self.assertEqual(len(tenant), 4)
+
+    def test_union(self):
+        other = ToolCollection([Tool(test_function3)])
+        union = self.collection.union(other)
+        self.assertEqual(len(union.schema()), 3)
+        with self.assertRaises(ValueError):
+            self.collection.union(ToolCollection([self.shadow]))
+
+
 class TestToolCollectionExampleModule(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+import unittest
+from typing import Dict, List, Optional
+
+import jsonschema
+
+from llmfuncs import validator
+from llmfuncs.tool import Tool
+
+
+def score(name: str, weights: List[Dict[str, int]], bias: Optional[float] = None) -> float:
+    """Score a candidate.
+
+    Args:
+        name (str): The candidate name.
+        weights (List[Dict[str, int]]): Named integer weights.
+        bias (float, optional): Constant added to the score.
+    """
+    return 0.0
+
+
+class TestCompileSchema(unittest.TestCase):
+
+    def test_matches_jsonschema(self):
+        params_schema = Tool(score).schema()["parameters"]
+        check = validator.compile_schema(params_schema)
+        samples = [
+            {"name": "a", "weights": []},
+            {"name": "a", "weights": [{"x": 1}], "bias": 1},
+            {"name": "a", "weights": [{"x": 1.0}]},
+            {"name": "a", "weights": [{"x": True}]},
+            {"name": "a", "weights": [{"x": "1"}]},
+            {"name": 1, "weights": []},
+            {"name": "a"},
+            {"name": "a", "weights": [], "bias": "high"},
+            {"name": "a", "weights": [], "extra": None},
+            ["name"],
+        ]
+        for sample in samples:
+            expected = jsonschema.Draft202012Validator(params_schema).is_valid(sample)
+            self.assertEqual(check(sample), expected, sample)
+
+    def test_unsupported_keywords(self):
+        self.assertIsNone(validator.compile_schema({"type": "string", "pattern": "a+"}))
+
+
+class TestValidateBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.tool = Tool(score)
+        self.records = [
+            {"name": "a", "weights": [{"x": 1}]},
+            {"name": "b"},
+            {"name": "c", "weights": [{"x": "1"}]},
+            {"name": "d", "weights": [], "bias": 0.5},
+        ]
+
+    def test_validate_records(self):
+        result = self.tool.validate_batch(iter(self.records), chunk_size=3)
+        self.assertEqual(list(result.passed), [1, 0, 0, 1])
+        self.assertEqual(sorted(result.errors), [1, 2])
+        self.assertIn("'weights' is a required property", result.errors[1])
+        self.assertEqual(result.passed_count(), 2)
+        self.assertEqual(result.failed_count(), 2)
+
+    def test_validate_jsonl(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            for record in self.records:
+                f.write(json.dumps(record) + "\n")
+            f.write("{not json}\n")
+        try:
+            result = self.tool.validate_batch(f.name)
+        finally:
+            os.remove(f.name)
+        self.assertEqual(list(result.passed), [1, 0, 0, 1, 0])
+        self.assertTrue(result.errors[4].startswith("Failed to parse JSON"))
+
+    def test_uncompilable_schema_falls_back(self):
+        func_schema = {
+            "type": "object",
+            "properties": {"code": {"type": "string", "pattern": "^[A-Z]+$"}},
+        }
+        result = validator.validate_batch([{"code": "AB"}, {"code": "ab"}], func_schema)
+        self.assertEqual(list(result.passed), [1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()